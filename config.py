@@ -6,108 +6,221 @@ config.py
 @author: charles mégnin
 
 The Config object encapsulates the configuration data contained in the yaml file
-The configuration data is stored in the dictionary self._parameters and *each* element
-can be accessed separately via getters.
+The raw configuration data is stored in the dictionary self._parameters; the values used
+by the getters are flattened once into a frozen ConfigData record (self._data) and *each*
+element can be accessed separately via getters or the equivalent public attributes
+(conf.ema, conf.buffer, conf.long_mad, ...).
 
 - debug boolean to turn printing of some variables on/off
 - date_format is the expected date format according to the datetime.datetime nomenclature
 - periods tuple is min & max periodicity values for the moving averages (min, max)
 - buffer is the tolerance around the adjusted close for an event to qualify as a change.
 - T/F flags for EMA and SMA
+
+Config objects are read-only once loaded: load_config() returns a process-wide shared
+instance per configuration file.
 """
+import os
 import sys
+import pickle
+import functools
+import hashlib
+import types
+from dataclasses import dataclass
 import utilities.system_utilities as sys_util
 import utilities.io_utilities as io_util
 
+
+@dataclass(frozen=True, slots=True)
+class ConfigData:
+    """Flat, immutable view of the configuration values exposed by the Config getters"""
+    debug: bool
+    date_format: str
+    years: int
+    ema: bool
+    sma: bool
+    period: dict
+    buffers: dict
+    fixed_buffer: bool
+    buffer: float
+    strategy: str
+    data_dir: str
+    mad_compute: bool
+    mad_long: int
+    mad_short: int
+    mad_plot: bool
+    pandas_display: dict
+    of_plot: dict
+    ts_plot: dict
+
+
+def _read_only(value):
+    """Return value with its nested dicts as read-only mappings and its lists as tuples"""
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: _read_only(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_read_only(item) for item in value)
+    return value
+
+
+def _data_field(field:str) -> property:
+    """Read-only Config attribute delegating to a field of its ConfigData"""
+    return property(lambda self: getattr(self._data, field),
+                    doc=f'Read-only ConfigData.{field}')
+
+
 class Config:
     """
     This class encapsulates the configuration parameters loaded from the config.yaml file
     Input:
         - the yaml filename where the parameters are stored
     """
+    # Public read-only attributes (conf.ema rather than conf.get_ema()), read from the
+    # frozen ConfigData: assigning them raises AttributeError
+    debug = _data_field('debug')
+    date_format = _data_field('date_format')
+    years = _data_field('years')
+    ema = _data_field('ema')
+    sma = _data_field('sma')
+    periods = _data_field('period')
+    buffers = _data_field('buffers')
+    fixed_buffer = _data_field('fixed_buffer')
+    buffer = _data_field('buffer')
+    strategy = _data_field('strategy')
+    data_dir = _data_field('data_dir')
+    mad = _data_field('mad_compute')
+    long_mad = _data_field('mad_long')
+    short_mad = _data_field('mad_short')
+    mad_plot = _data_field('mad_plot')
 
     def __init__(self, config_filename:str):
         self._parameters = {} # dictionary of configuration variables
+        self._data = None # flattened ConfigData built from self._parameters
+        self._readonly_view = None # read-only mapping over self._parameters
         self._load_configuration_file(config_filename)
         self._load_parameters()
 
     # --- GETTERS --- #
     def get_config_parameters(self):
-        """return all parameters as a dictionary"""
-        return self._parameters
+        """return all parameters as a read-only mapping, nested mappings included (shared, no copy needed)"""
+        return self._readonly_view
 
 
     def get_pandas_display(self):
         """Returns pandas display parameters as a dictionary"""
-        return self._parameters['pandas_display']
+        return self._data.pandas_display
 
 
     def get_plot_parameters(self, plot_type:str):
         """Return plot parameters as a dictionary"""
-        if plot_type not in ["of_plot", "ts_plot"]:
-            raise ValueError(f'plot type {plot_type} should be "of_plot" or "ts_plot"')
-        return self._parameters[plot_type]
+        if plot_type == "of_plot":
+            return self._data.of_plot
+        if plot_type == "ts_plot":
+            return self._data.ts_plot
+        raise ValueError(f'plot type {plot_type} should be "of_plot" or "ts_plot"')
 
     def get_debug(self):
         """Getter for the boolean debug parameter"""
-        return self._parameters['debug']
+        return self.debug
 
 
     def get_date_format(self):
         """Getter for the date_format parameter"""
-        return self._parameters['date_format']
+        return self.date_format
 
 
     def get_periods(self):
         """Returns the min/max period parameter as a dictionary"""
-        return self._parameters['period']
+        return self.periods
 
 
     def get_ema(self):
         """Returns True / False value for exponential moving average"""
-        return self._parameters['moving_averages']['ema']
+        return self.ema
 
 
     def get_sma(self):
         """Returns True False value for simple moving average"""
-        return self._parameters['moving_averages']['sma']
+        return self.sma
 
 
     def get_mad(self):
         """Returns True/False value for MAD analysis"""
-        return self._parameters["mad"]["compute"]
+        return self.mad
 
 
     def get_long_MAD(self):
         """Return the long-period MAD"""
-        return self._parameters['mad']["long_period"]
+        return self.long_mad
 
 
     def get_short_MAD(self):
         """Return the short-period MAD"""
-        return self._parameters["mad"]["short_period"]
+        return self.short_mad
+
+
+    def get_plot_mad(self):
+        """Returns True/False value for the MAD performance plot"""
+        return self.mad_plot
 
 
     def get_buffers(self):
-        """Getter for the buffer parameter"""
-        print(self._parameters["buffers"])
-        return self._parameters["buffers"]  # Return 'buffers' section or an empty dict if not found
+        """Getter for the buffer parameters as a dictionary"""
+        return self.buffers
+
+
+    def get_fixed_buffer(self):
+        """Returns True if the buffer is fixed (2D objective function)"""
+        return self.fixed_buffer
+
+
+    def get_buffer(self):
+        """Getter for the fixed buffer value"""
+        return self.buffer
 
 
     def get_strategy(self):
         """Getter for the strategy parameter"""
-        return self._parameters['strategy']
+        return self.strategy
+
+
+    def get_data_dir(self):
+        """Getter for the data directory"""
+        return self.data_dir
 
 
     def get_years(self):
         """Getter for the number of years of data required"""
-        return self._parameters['years']
+        return self.years
 
 
     def _load_parameters(self):
         """Constructor"""
         try:
             self._parameters = self._config.copy()
+            # Read-only at every level: the Config is shared by all load_config callers
+            self._readonly_view = _read_only(self._parameters)
+            parameters = self._readonly_view
+            self._data = ConfigData(
+                debug=parameters['debug'],
+                date_format=parameters['date_format'],
+                years=parameters['years'],
+                ema=parameters['moving_averages']['ema'],
+                sma=parameters['moving_averages']['sma'],
+                period=parameters['period'],
+                buffers=parameters['buffers'],
+                fixed_buffer=parameters['buffers']['fixed'],
+                buffer=parameters['buffers']['buffer'],
+                strategy=parameters['strategy'],
+                data_dir=parameters['data_dir'],
+                mad_compute=parameters['mad']['compute'],
+                mad_long=parameters['mad']['long_period'],
+                mad_short=parameters['mad']['short_period'],
+                mad_plot=parameters['mad'].get('plot', False),
+                pandas_display=parameters['pandas_display'],
+                of_plot=parameters['of_plot'],
+                ts_plot=parameters['ts_plot'],
+            )
         except Exception as e:
             sys_util.terminate('Failed to load configuration parameters', e, self.__class__.__name__, sys._getframe())
 
@@ -116,13 +229,82 @@ class Config:
     def _load_configuration_file(self, config_filepath:str):
         """
         Loads the yaml data from file into the _config variable.
+        The parsed data is cached in a pickle sidecar ({config_filepath}.pkl) keyed by the
+        file modification time and the SHA-256 of its contents: YAML is only re-parsed
+        when the file actually changes.
 
         Input:
             - yaml filepath
         """
-        self._config = io_util.load_yaml_file(config_filepath)
+        cache_path = f'{config_filepath}.pkl'
+        try:
+            mtime = os.path.getmtime(config_filepath)
+        except OSError:
+            mtime = None # let load_yaml_file report the missing file
+
+        cached = self._read_cache(cache_path)
+        # Fast path: unchanged modification time, skip hashing
+        if cached is not None and mtime is not None and cached['mtime'] == mtime:
+            self._config = cached['config']
+            return
+
+        digest = self._hash_file(config_filepath)
+        if cached is not None and digest is not None and cached['sha256'] == digest:
+            self._config = cached['config']
+        else:
+            self._config = io_util.load_yaml_file(config_filepath)
+        self._write_cache(cache_path, {'mtime': mtime, 'sha256': digest, 'config': self._config})
+
+
+    @staticmethod
+    def _hash_file(filepath:str):
+        """Return the SHA-256 hex digest of a file or None if it cannot be read"""
+        try:
+            with open(filepath, 'rb') as c_file:
+                return hashlib.sha256(c_file.read()).hexdigest()
+        except OSError:
+            return None
+
+
+    @staticmethod
+    def _read_cache(cache_path:str):
+        """Return the cached configuration record or None if absent/unreadable"""
+        try:
+            with open(cache_path, 'rb') as c_file:
+                cached = pickle.load(c_file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        if not isinstance(cached, dict) or not {'mtime', 'sha256', 'config'} <= cached.keys():
+            return None
+        return cached
+
+
+    def _write_cache(self, cache_path:str, record:dict):
+        """Write the configuration record to the pickle sidecar (failure is not fatal)"""
+        if record['sha256'] is None:
+            return
+        try:
+            with open(cache_path, 'wb') as c_file:
+                pickle.dump(record, c_file, protocol=5)
+        except OSError as e:
+            sys_util.warning(f'Could not write configuration cache {cache_path}',
+                             e, self.__class__.__name__, sys._getframe())
 
 
     def print_parameters(self):
         """Output all config parameters to stdout"""
         io_util.pretty_print(self._parameters)
+
+
+def load_config(config_filename:str) -> Config:
+    """
+    Return the Config for config_filename, shared across the process.
+    The path is normalized so that different spellings of the same file hit the same entry.
+    """
+    return _load_config(os.path.realpath(config_filename))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_config(config_filepath:str) -> Config:
+    """Cached Config constructor keyed by the normalized file path"""
+    return Config(config_filepath)
@@ -17,10 +17,19 @@ returns the time series as a pandas data frame containing:
 
 API key from environment
 """
+import io
 import os
 import sys
-from datetime import datetime
-from alpha_vantage.timeseries import TimeSeries
+import time
+import logging
+import functools
+import threading
+from urllib.parse import urlencode
+from urllib.request import urlopen
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
 from alpha_vantage.fundamentaldata import FundamentalData
 import config
 import request
@@ -28,6 +37,30 @@ import utilities.system_utilities as sys_util
 import utilities.time_utilities as time_util
 import utilities.io_utilities as io_util
 
+QUERY_URL = 'https://www.alphavantage.co/query'
+DAILY_ADJUSTED_CSV_QUERY = {'function': 'TIME_SERIES_DAILY_ADJUSTED', # plus symbol & apikey
+                            'outputsize': 'full',
+                            'datatype': 'csv',
+                            }
+DAILY_ADJUSTED_CSV_HEADER = 'timestamp,' # first bytes of a valid CSV response
+DOWNLOAD_TIMEOUT = 60 # seconds
+RESPONSE_HEAD_LENGTH = 200 # characters of an invalid response reported in the error message
+RESPONSE_CACHE_DIR = '.av_cache' # response cache sub-directory of the data directory
+RESPONSE_CACHE_TTL = 24 * 3600 # seconds: daily data changes at most once a day
+PRICE_DTYPE = np.float32 # adjusted close & spread
+VOLUME_DTYPE = np.uint64
+TIME_SERIES_CACHE_SUFFIX = '_time_series' # processed time series cache (parquet)
+OVERVIEW_CACHE_FILE = 'overview_cache.json' # company overviews by ticker
+OVERVIEW_CACHE_TTL = 30 * 24 * 3600 # seconds: company name/exchange/currency rarely change
+
+logger = logging.getLogger(__name__)
+
+_FD_CLIENT = None # FundamentalData client shared by all Downloader instances
+_client_lock = threading.Lock()
+
+_overview_cache = {} # {cache filepath: {ticker: {'timestamp': float, 'overview': dict}}}
+_overview_lock = threading.Lock()
+
 @time_util.timing_decorator
 class Downloader:
     """
@@ -47,18 +80,30 @@ class Downloader:
     def __init__(self, conf:config.Config, req:request.Request):
         self._configuration = conf
         self._request = req
+        self._date_format = conf.date_format
+        self._parse_date = time_util.date_parser(self._date_format)
+        self._cache_dir = os.path.join(conf.data_dir, RESPONSE_CACHE_DIR)
         self._time_series = None
 
         # Load data, preprocess, and filter based on request
-        self._load_data()
-        self._apply_date_window(*self._request.get_dates("requested").values())
-        self._preprocess()
-        self._postprocess()
+        if self._load_cached_time_series(*self._request.get_dates("requested").values()):
+            self._load_company()
+        else:
+            self._load_data()
+            self._apply_date_window(*self._request.get_dates("requested").values())
+            self._preprocess()
+            self._postprocess()
+            self._cache_time_series(*self._request.get_dates("requested").values())
+        self._freeze_time_series()
         self._update_request()
 
     #--- Getter ---#
     def get_time_series(self):
-        """Getter for the time series and its metadata"""
+        """
+        Getter for the time series and its metadata.
+        The DataFrame is shared, not copied, and its buffers are read-only:
+        callers that need to modify it in place must call .copy() first.
+        """
         return self._time_series, self._meta
 
 
@@ -70,55 +115,192 @@ class Downloader:
 
     # --- Data Loading ---#
     def _load_data(self):
-        """Load stock and company data"""
-        self._load_time_series()
-        self._load_company()
+        """Load stock and company data (independent API calls issued concurrently)"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(self._load_time_series),
+                       executor.submit(self._load_company),
+                       ]
+            # Re-raise any exception (incl. SystemExit from terminate) in the calling thread
+            for future in futures:
+                future.result()
+
+
+    def _cached_api_call(self, name:str, fetch):
+        """
+        Return the response of an API call from the on-disk response cache if it is
+        less than RESPONSE_CACHE_TTL old, otherwise call fetch() and cache its result.
+        Failed calls raise before anything is cached.
+
+        Input:
+            - name of the call, used with the ticker to build the cache filename
+            - fetch: callable issuing the API call
+        """
+        filename = f'{self._request.get_ticker()}_{name}.pkl'
+        response = io_util.load_pickle_file(os.path.join(self._cache_dir, filename),
+                                            max_age=RESPONSE_CACHE_TTL)
+        if response is None:
+            response = fetch()
+            io_util.pickle_to_file(response, self._cache_dir, filename)
+        return response
 
 
     def _load_company(self):
-        """Load fundamental company data"""
-        fd = FundamentalData(key = os.getenv('ALPHAVANTAGE_API_KEY'))
-        try:
-            data = fd.get_company_overview(self._request.get_ticker())
-        except ValueError as e:
-            sys_util.warning(f'Could not get fundamental data for ticker {self._request.get_ticker()}',
-                             e, self.__class__.__name__, sys._getframe())
-            # Should handle the downloading of this data through other means here
-        else:
-            self._request.set_company_name(data[0]['Name'])
-            self._request.set_company_exchange(data[0]['Exchange'])
-            self._request.set_company_currency(data[0]['Currency'])
+        """
+        Load fundamental company data, unless the request already holds it.
+        Overviews are kept in a write-through JSON cache for OVERVIEW_CACHE_TTL.
+        """
+        if {'name', 'exchange', 'currency'} <= self._request.get_company_info().keys():
+            return
+        overview = self._get_cached_overview()
+        if overview is None:
+            try:
+                overview = self._download_company()[0]
+            except ValueError as e:
+                sys_util.warning(f'Could not get fundamental data for ticker {self._request.get_ticker()}',
+                                 e, self.__class__.__name__, sys._getframe())
+                # Should handle the downloading of this data through other means here
+                return
+            self._cache_overview(overview)
+        self._request.set_company_name(overview['Name'])
+        self._request.set_company_exchange(overview['Exchange'])
+        self._request.set_company_currency(overview['Currency'])
+
+
+    def _overview_cache_entries(self) -> dict:
+        """Return the overview cache of this data directory (loaded from disk on first use)"""
+        filepath = os.path.join(self._cache_dir, OVERVIEW_CACHE_FILE)
+        if filepath not in _overview_cache:
+            _overview_cache[filepath] = io_util.load_json_file(filepath) or {}
+        return _overview_cache[filepath]
+
+
+    def _get_cached_overview(self):
+        """Return the cached company overview for the ticker or None if absent or expired"""
+        with _overview_lock:
+            entry = self._overview_cache_entries().get(self._request.get_ticker())
+        if entry is None or time.time() - entry['timestamp'] > OVERVIEW_CACHE_TTL:
+            return None
+        return entry['overview']
+
+
+    def _cache_overview(self, overview:dict):
+        """Store the company overview for the ticker and write the cache through to disk"""
+        with _overview_lock:
+            entries = self._overview_cache_entries()
+            entries[self._request.get_ticker()] = {'timestamp': time.time(), 'overview': overview}
+            io_util.json_to_file(entries, self._cache_dir, OVERVIEW_CACHE_FILE)
+
+
+    def _download_company(self):
+        """Download fundamental company data from data source"""
+        return _fundamental_data_client().get_company_overview(self._request.get_ticker())
 
 
     def _load_time_series(self):
         """
-        Load time series from data source as a pandas DataFrame
+        Load time series (from the response cache or data source) as a pandas DataFrame
         """
-        # Instantiate a TimeSeries object
+        self._time_series, self._meta, *_ = self._cached_api_call('daily_adjusted_csv',
+                                                                  self._download_time_series)
+        # Data source returns the most recent day first: sort once so that date windows
+        # are binary searches on a monotonic index
+        if not self._time_series.index.is_monotonic_increasing:
+            self._time_series.sort_index(inplace=True)
+
+
+    def _download_time_series(self):
+        """
+        Download time series from the data source CSV endpoint as a pandas DataFrame.
+        Only the columns used by _preprocess are parsed.
+        Returns the (DataFrame, metadata) tuple.
+        """
+        ticker = self._request.get_ticker()
+        # Parameters are URL-encoded: tickers may contain '&', '+' or spaces
+        query = urlencode({**DAILY_ADJUSTED_CSV_QUERY, 'symbol': ticker, 'apikey': _api_key()})
         try:
-            ts = TimeSeries(key = os.getenv('ALPHAVANTAGE_API_KEY'),
-                            output_format = 'pandas',
-                            )
-        except BaseException as e:
-            sys_util.terminate('Could not instantiate TimeSeries object from alpha vantage',
+            with urlopen(f'{QUERY_URL}?{query}', timeout=DOWNLOAD_TIMEOUT) as response:
+                body = response.read().decode('utf-8')
+        except OSError as e:  # network & HTTP errors
+            sys_util.terminate('Could not download daily adjusted TimeSeries from alpha vantage',
                                 e, self.__class__.__name__, sys._getframe()
                                 )
-        # API call to download data
+        # API errors (invalid key, rate limit, unknown symbol) come back as a JSON
+        # or plain-text body: report it rather than a missing-column parse error
+        if not body.startswith(DAILY_ADJUSTED_CSV_HEADER):
+            sys_util.terminate(f'Alpha vantage returned no daily adjusted TimeSeries for {ticker}',
+                                ValueError(body[:RESPONSE_HEAD_LENGTH]),
+                                self.__class__.__name__, sys._getframe()
+                                )
         try:
-            self._time_series, self._meta, *_ = ts.get_daily_adjusted(self._request.get_ticker(),
-                                                                      outputsize = 'full'
-                                                                      )
-        except BaseException as e:
-            sys_util.terminate('Could not download daily adjusted TimeSeries from alpha vantage',
+            time_series = pd.read_csv(io.StringIO(body),
+                                      usecols=['timestamp', 'high', 'low', 'adjusted_close', 'volume'],
+                                      index_col='timestamp',
+                                      parse_dates=['timestamp'],
+                                      dtype={'high': PRICE_DTYPE,
+                                             'low': PRICE_DTYPE,
+                                             'adjusted_close': PRICE_DTYPE,
+                                             },
+                                      )
+        except ValueError as e:  # unexpected columns or values (pandas parser errors are ValueErrors)
+            sys_util.terminate('Could not parse daily adjusted TimeSeries from alpha vantage: '
+                                f'{body[:RESPONSE_HEAD_LENGTH]}',
                                 e, self.__class__.__name__, sys._getframe()
                                 )
+        time_series.index.name = 'date'
+        meta = {'1. Information': 'Daily Time Series with Splits and Dividend Events',
+                '2. Symbol': ticker,
+                '3. Last Refreshed': time_series.index.max().strftime(time_util.ISO_DATE_FORMAT),
+                '4. Output Size': 'Full size',
+                }
+        return time_series, meta
 
 
-    #--- Data processing ---#
-    def _apply_date_window(self, start_date: str, end_date: str):
-        """Filter rows according to specified date window"""
-        date_format = self._configuration.get_date_format()
+    def _load_cached_time_series(self, start_date: str, end_date: str) -> bool:
+        """
+        Load the processed time series from the parquet cache if the cached request
+        covers the requested date window with complete (no longer updated) data.
+        Returns True if the time series was loaded from cache.
+        """
+        cached = io_util.load_parquet_file(self._cache_dir, self._cache_prefix())
+        if cached is None:
+            return False
+        attrs, cached.attrs = cached.attrs, {}
+        t_start, t_end = self._get_date_window(start_date, end_date)
+        try:
+            covered = (datetime.fromisoformat(attrs['start_date']) <= t_start
+                       and t_end <= datetime.fromisoformat(attrs['end_date'])
+                       and t_end < datetime.fromisoformat(attrs['complete_before']))
+        except (KeyError, TypeError, ValueError):
+            return False
+        if not covered:
+            return False
+        self._time_series = cached.loc[t_start:t_end]
+        self._meta = attrs.get('meta')
+        return True
 
+
+    def _cache_time_series(self, start_date: str, end_date: str):
+        """Write the processed time series to the parquet cache with the requested date window"""
+        t_start, t_end = self._get_date_window(start_date, end_date)
+        # Downloaded data may be up to RESPONSE_CACHE_TTL old: only earlier days are final
+        complete_before = datetime.now() - timedelta(seconds=RESPONSE_CACHE_TTL)
+        cached = self._time_series.copy(deep=False)
+        cached.attrs = {'start_date': t_start.isoformat(),
+                        'end_date': t_end.isoformat(),
+                        'complete_before': complete_before.date().isoformat(),
+                        'meta': self._meta,
+                        }
+        io_util.dataframe_to_parquet(cached, self._cache_dir, self._cache_prefix())
+
+
+    def _cache_prefix(self) -> str:
+        """Filename prefix of the processed time series cache"""
+        return f'{self._request.get_ticker()}{TIME_SERIES_CACHE_SUFFIX}'
+
+
+    #--- Data processing ---#
+    def _get_date_window(self, start_date: str, end_date: str):
+        """Return the date window as a (start, end) tuple of datetimes"""
         # Check if start_date and end_date are datetime objects, if so, no need to convert
         if isinstance(start_date, datetime) and isinstance(end_date, datetime):
             t_start = start_date
@@ -126,37 +308,45 @@ class Downloader:
         else:
             # Only convert to datetime if they are string
             try:
-                t_start = datetime.strptime(start_date, date_format)
-                t_end = datetime.strptime(end_date, date_format)
+                t_start = self._parse_date(start_date)
+                t_end = self._parse_date(end_date)
             except ValueError as e:
                 sys_util.terminate(f'Format error with start ({start_date}) or end ({end_date}) date',
                                 e, self.__class__.__name__, sys._getframe())
 
         # Date window consistency check
         assert t_start <= t_end, f'Start date {start_date} after end date {end_date}'
+        return t_start, t_end
+
+
+    def _apply_date_window(self, start_date: str, end_date: str):
+        """Filter rows according to specified date window"""
+        t_start, t_end = self._get_date_window(start_date, end_date)
 
         # Apply date window to initial time series
-        self._time_series = self._time_series.sort_index().loc[t_start:t_end]
+        self._time_series = self._time_series.loc[t_start:t_end]
 
 
     def _preprocess(self):
         """
-        Preprocess raw data:
-        - rename data columns
-        - compute spread column (day high - low)
-        - extract columns adj close, spread & volume
+        Preprocess raw data into a single new DataFrame:
+        - adj close & volume columns taken from the raw data under their new names
+        - spread column computed as day high - low
+        - prices downcast to PRICE_DTYPE
         """
         try:
-            # Rename columns
-            self._time_series.rename(columns={
-                '1. open':'open',
-                '5. adjusted close': 'adj_close',
-                '6. volume': 'volume',
-                }, inplace=True)
-            # Compute spread
-            self._time_series['spread'] = self._time_series['2. high'] - self._time_series['3. low']
-            # Retain only necessary columns
-            self._time_series = self._time_series[['adj_close', 'spread', 'volume']]
+            raw = self._time_series
+            # Prices are stored as float32 (7 significant digits) to halve memory traffic
+            spread = np.empty(raw.shape[0], dtype=PRICE_DTYPE)
+            np.subtract(raw['high'].to_numpy(), raw['low'].to_numpy(), out=spread, casting='same_kind')
+            # One construction: no rename, column insertion or projection copies
+            self._time_series = pd.DataFrame({'adj_close': raw['adjusted_close'].to_numpy(PRICE_DTYPE),
+                                              'spread': spread,
+                                              'volume': raw['volume'].to_numpy(),
+                                              },
+                                             index=raw.index,
+                                             copy=False,
+                                             )
         except Exception as e:
             sys_util.terminate(
                 "Error during preprocessing of raw data", e, self.__class__.__name__, sys._getframe()
@@ -164,20 +354,62 @@ class Downloader:
 
 
     def _postprocess(self):
-        """Post-processing: remove duplicates and null values"""
-        self._time_series.drop_duplicates(inplace = True)
-        self._time_series.dropna(inplace=True)
+        """
+        Post-processing on the narrow date-windowed frame: remove duplicate dates and null values,
+        downcast volume to VOLUME_DTYPE.
+        Daily bars are unique per date, so duplicates are detected on the index alone
+        rather than by hashing every column value.
+        """
+        duplicated = self._time_series.index.duplicated()
+        if duplicated.any():
+            self._time_series = self._time_series[~duplicated]
+        self._time_series = self._time_series.dropna()
+        # Volume is integral: downcast once null values are gone
+        self._time_series = self._time_series.astype({'volume': VOLUME_DTYPE})
+
+
+    def _freeze_time_series(self):
+        """
+        Rebuild self._time_series over read-only views of its columns (no data copy)
+        so the frame can be shared: in-place writes raise instead of altering the shared data
+        """
+        columns = {}
+        for column in self._time_series.columns:
+            values = self._time_series[column].to_numpy()
+            values.flags.writeable = False
+            columns[column] = values
+        self._time_series = pd.DataFrame(columns, index=self._time_series.index, copy=False)
 
 
     def _update_request(self):
         """Update the request object with the actual start and end dates"""
-        date_format = self._configuration.get_date_format()
         self._request.set_actual_dates(
-            start_date=self._time_series.index[0].date().strftime(date_format),
-            end_date=self._time_series.index[-1].date().strftime(date_format),
+            start_date=self._time_series.index[0].date().strftime(self._date_format),
+            end_date=self._time_series.index[-1].date().strftime(self._date_format),
         )
 
     #--- I/O ---#
     def print_time_series(self):
         """Print the time series"""
         io_util.pretty_print(self.get_time_series())
+
+
+@functools.cache
+def _api_key():
+    """
+    Return the API key from the environment, read on first download (cached runs never
+    need it): warns once if it is not set.
+    """
+    api_key = os.getenv('ALPHAVANTAGE_API_KEY')
+    if not api_key:
+        logger.warning('Environment variable ALPHAVANTAGE_API_KEY is not set: downloads will fail')
+    return api_key
+
+
+def _fundamental_data_client() -> FundamentalData:
+    """Return the FundamentalData client shared across Downloader instances (created on first use)"""
+    global _FD_CLIENT
+    with _client_lock:
+        if _FD_CLIENT is None:
+            _FD_CLIENT = FundamentalData(key = _api_key())
+        return _FD_CLIENT
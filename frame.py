@@ -18,15 +18,24 @@ import request
 import utilities.system_utilities as sys_util
 import utilities.time_utilities as time_util
 import utilities.io_utilities as io_util
+import utilities.moving_average_utilities as ma_util
 #debug
 import plotly.graph_objs as go
 import plotly.io as pio
 
 ZONES = ['High', 'Low', 'Mid'] # close is above, below or within buffer zone
+ZONE_CODES = [1, -1, 0] # int8 codes of ZONES stored in the zone columns
 POSITIONS = ['Long', 'Short', 'Side'] # position to take as a function of the strategy
 RECOMMENDATIONS = ['B', 'S', ''] # recommendation necessary to be in required position
+# Recommendation code for a position change: rows = previous, columns = current position code
+# Side -> Long, Short -> Long: Buy; Long -> Short, Long -> Side, Side -> Short: Sell; else Hold
+TRANSITIONS = np.array([[2, 1, 1],
+                        [0, 2, 2],
+                        [0, 1, 2]], dtype=np.int8)
 MOVING_AVGS = ['exponential', 'simple', 'both']
 INITIAL_CAPITAL = 1000 #for back-testing
+MAD_SIGNAL_COLUMNS = 5 # SHORT_MAD, LONG_MAD, MAD, MAD_Signal, MAD_Position lead the MAD frame
+DERIVED_DTYPE = np.float32 # moving averages & buffers: halves memory traffic, prices need no more precision
 
 @time_util.timing_decorator
 class Frame:
@@ -35,7 +44,7 @@ class Frame:
     It adds a number of columns to the raw data:
     - moving averages / prefix EMA or SMA
     - buffers around moving average / suffix + or -
-    - a zone column Z_period that flags the close as being above, below or within the buffer zone
+    - a zone (intermediate, not stored) that flags the close as being above, below or within the buffer zone
     - a position column that flags whether the strategy requires a long, short or side position on a given day
     - a recommendation column that flags the action to take on any given day to achieve the position
     - spread and volume scaled to close (not implemented)
@@ -51,21 +60,28 @@ class Frame:
         self._time_series = df
         self._request = req
         # Set various configuration parameters as variables
-        self._debug = self._config.get_debug()
-        self._buffers = self._config.get_buffers()
-        self._period_range = self._config.get_periods()
-        self._ema = self._config.get_ema()
-        self._sma = self._config.get_sma()
-
-        self._strategy = self._config.get_strategy()
+        self._debug = self._config.debug
+        self._fixed_buffer = self._config.fixed_buffer
+        self._buffer = self._config.buffer
+        self._period_range = self._config.periods
+        self._ema = self._config.ema
+        self._sma = self._config.sma
+
+        self._strategy = self._config.strategy
+        # Adjusted close as a float64 array, extracted once and shared by the builders
+        self._adj_close = self._time_series['adj_close'].to_numpy(np.float64)
         assert self._strategy == "long", "Only long strategy implemented"
 
+        self._recommendation_codes = None # [P, N] int8 recommendation codes, one row per period
         self._build_derived_data()
         # Perform MAD analysis if requested
-        if self._config.get_mad():
-            self._build_MAD()
-
-        self._cleanup()
+        self._mad_frame = None
+        self._mad_buy_rows = None # row positions of the MAD buy signals
+        self._mad_sell_rows = None # row positions of the MAD sell signals
+        if self._config.mad:
+            self._mad_frame = self._build_MAD()
+            if self._config.mad_plot:
+                self.plot_mad()
 
 
     #--- GETTERS ---#
@@ -74,9 +90,28 @@ class Frame:
         return self._time_series
 
 
+    def get_recommendation_codes(self):
+        """
+        Return the recommendation codes (indices in RECOMMENDATIONS, -1 on the first day) as a
+        read-only [P, N] int8 array, one row per period from min to max (None without EMA).
+        Same values as the R_{period}_{strategy} columns, without going through the categoricals.
+        """
+        return self._recommendation_codes
+
+
+    def get_mad_frame(self):
+        """Return the MAD analysis dataframe (None if not computed)"""
+        return self._mad_frame
+
+
     def get_buy_signals(self):
-        """Return the buy signals dataframe"""
-        return self._mad_buy_signals
+        """Return the buy signals dataframe (None if the MAD analysis was not computed)"""
+        return self._mad_signals(self._mad_buy_rows)
+
+
+    def get_sell_signals(self):
+        """Return the sell signals dataframe (None if the MAD analysis was not computed)"""
+        return self._mad_signals(self._mad_sell_rows)
 
 
     #--- I/O ---#
@@ -99,33 +134,63 @@ class Frame:
 
     def _build_MAD(self) -> pd.DataFrame:
         """Perform Moving Average Distance (MAD) analysis and backtest the strategy."""
-        symbol = self._request.get_ticker()
-        short_window, long_window = self._config.get_short_MAD(), self._config.get_long_MAD()
-
-        # Calculate moving averages
-        adj_close = self._time_series["adj_close"]
+        short_window, long_window = self._config.short_mad, self._config.long_mad
+
+        # Calculate moving averages from the cumulative sum of the close
+        close = self._adj_close
+        cum_close = ma_util.cumulative_sum(close)
+        short_mad = ma_util.simple_moving_average(cum_close, short_window)
+        long_mad = ma_util.simple_moving_average(cum_close, long_window)
+
+        # Calculate MAD and trading signals on the numpy arrays
+        signal = (short_mad > long_mad).astype(np.int8)
+        # Change of signal, NaN on the first day (same as pandas diff)
+        position = np.full(len(signal), np.nan)
+        position[1:] = np.diff(signal.astype(np.float64))
         ts = pd.DataFrame(index=self._time_series.index)
-        ts["SHORT_MAD"] = adj_close.rolling(window=short_window).mean()
-        ts["LONG_MAD"] = adj_close.rolling(window=long_window).mean()
+        ts["SHORT_MAD"] = short_mad
+        ts["LONG_MAD"] = long_mad
+        ts["MAD"] = short_mad - long_mad
+        ts["MAD_Signal"] = signal
+        ts["MAD_Position"] = position
+
+        # Identify buy and sell signals (row positions, the frames are built on request)
+        self._mad_buy_rows = np.flatnonzero(position == 1)
+        self._mad_sell_rows = np.flatnonzero(position == -1)
+
+        # Backtest strategy on the numpy arrays (signal of the previous day, NaN on the first day)
+        # (slices: an empty close gives empty columns)
+        daily_return = np.full_like(close, np.nan)
+        daily_return[1:] = close[1:] / close[:-1] - 1
+        previous_signal = np.full_like(close, np.nan)
+        previous_signal[1:] = signal[:-1]
+        strategy_return = daily_return * previous_signal
 
-        # Calculate MAD and trading signals
-        ts["MAD"] = ts["SHORT_MAD"] - ts["LONG_MAD"]
-        ts["MAD_Signal"] = (ts["SHORT_MAD"] > ts["LONG_MAD"]).astype(int)
-        ts["MAD_Position"] = ts["MAD_Signal"].diff()
+        # Compute cumulative returns
+        ts["Daily_Return"] = daily_return
+        ts["Strategy_Return"] = strategy_return
+        ts["Cumulative_Strategy_Return"] = _cumulative_return(strategy_return) * INITIAL_CAPITAL
+        ts["Cumulative_Buy_Hold_Return"] = _cumulative_return(daily_return) * INITIAL_CAPITAL
+        return ts
 
-        # Identify buy and sell signals
-        self._mad_buy_signals = ts.loc[ts["MAD_Position"] == 1]
-        self._mad_sell_signals = ts.loc[ts["MAD_Position"] == -1]
 
-        # Backtest strategy
-        ts["Daily_Return"] = adj_close.pct_change()
-        ts["Strategy_Return"] = ts["Daily_Return"] * ts["MAD_Signal"].shift(1)
+    def _mad_signals(self, rows:np.ndarray) -> pd.DataFrame:
+        """Return the MAD signal columns (SHORT_MAD to MAD_Position) at the given row positions"""
+        if self._mad_frame is None:
+            return None
+        return self._mad_frame.iloc[rows, :MAD_SIGNAL_COLUMNS]
 
-        # Compute cumulative returns
-        ts["Cumulative_Strategy_Return"] = (1 + ts["Strategy_Return"]).cumprod() * INITIAL_CAPITAL
-        ts["Cumulative_Buy_Hold_Return"] = (
-            1 + ts["Daily_Return"]
-        ).cumprod() * INITIAL_CAPITAL
+
+    def plot_mad(self, directory:str = None):
+        """
+        Plot the MAD strategy vs buy & hold cumulative returns.
+        The figure is displayed, or written to an html file in directory if provided.
+        """
+        if self._mad_frame is None:
+            sys_util.warning('No MAD analysis to plot (mad: compute is off)', None, self.__class__.__name__, sys._getframe())
+            return
+        symbol = self._request.get_ticker()
+        ts = self._mad_frame
 
         # Plot performance
         traces = [
@@ -142,242 +207,120 @@ class Frame:
             legend=dict(x=0, y=1), hovermode="x"
         )
 
-        pio.show(go.Figure(data=traces, layout=layout))
-        return ts
+        figure = go.Figure(data=traces, layout=layout)
+        if directory is None:
+            pio.show(figure)
+        else:
+            io_util.save_figure(figure, directory, f'{symbol}_mad', 'html')
 
 
     @time_util.timing_decorator
     def _build_derived_data(self):
         """
-        Builds and joins moving averages, buffers, zones, positions, and recommendations.
+        Builds and aggregates moving averages, buffers, zones, positions, and recommendations.
         1. build_moving_average MA
         2. build_buffers around MA
-        3. build_zone: determine the zone in which the close is located
+        3. build_zone: determine the zone in which the close is located (same pass as 2.)
         4. build_positions to determine required position in the zone
         5. build recommendations to determine recommended action to hold position
+        All periods are computed together as [P, N] arrays (one row per period) and the
+        columns are assembled in period order and concatenated once at the end.
         """
+        # Bound once and shared by the helpers below
+        close = self._adj_close
+        index = self._time_series.index
+        periods = range(self._period_range['min'], self._period_range['max'] + 1)
 
-        def _build_moving_average(col_name: str, ma_type: str, per: int) -> pd.DataFrame:
-            """
-            Builds a moving average column for a given period.
-
-            Args:
-                col_name (str): Name of the moving average column to create.
-                ma_type (str): Type of moving average ('exponential', 'simple', or 'both').
-                per (int): Period or span for the moving average.
-
-            Returns:
-                pd.DataFrame: DataFrame with the moving average column added.
+        def _build_moving_averages(ma_type: str) -> np.ndarray:
             """
-            ts = pd.DataFrame(index=self._time_series.index)
-            # Validate moving average type
-            ma_type = ma_type.lower() #??? why remove
-            # Handle Exponential Moving Average (EMA) and Simple Moving Average (SMA)
-            if ma_type in ["exponential", "both"]:
-                ts[col_name] = (self._time_series["adj_close"].ewm(span=per, adjust=False).mean())
-            if ma_type in ["simple", "both"]:
-                ts[col_name] = (self._time_series["adj_close"].rolling(window=per, min_periods=1).mean())
-
-            return ts
-
-
-        def _build_ma_differential(col_name: str, per: int) -> pd.DataFrame:
-            """Builds EMA-SMA differential column.
+            Builds the moving averages for all periods at once.
+            The adjusted close is read once and each period fills one row of a
+            [P, N] DERIVED_DTYPE block.
 
             Args:
-                col_name (str): Output column name.
-                per (int): Period for the moving averages.
+                ma_type (str): Type of moving average ('exponential' or 'simple').
 
             Returns:
-                pd.DataFrame: DataFrame with the EMA-SMA differential column.
+                np.ndarray: The moving averages, one row per period.
             """
-            ema_col = f"EMA_{per}"
-            sma_col = f"SMA_{per}"
-            # Ensure both EMA and SMA columns exist before calculating the differential
-            if ema_col not in self._time_series or sma_col not in self._time_series:
-                raise KeyError(f"Columns '{ema_col}' or '{sma_col}' are missing.")
-            ts = pd.DataFrame(index=self._time_series.index)
-            ts[col_name] = self._time_series[ema_col] - self._time_series[sma_col]
-            return ts
+            averages = np.empty((len(periods), len(close)), dtype=DERIVED_DTYPE)
+            if ma_type == MOVING_AVGS[0]: # same as ewm(span=period, adjust=False)
+                for row, per in enumerate(periods):
+                    averages[row] = ma_util.exponential_moving_average(close, per)
+            elif ma_type == MOVING_AVGS[1]: # same as rolling(window=period, min_periods=1)
+                cum_close = ma_util.cumulative_sum(close)
+                for row, per in enumerate(periods):
+                    averages[row] = ma_util.simple_moving_average(cum_close, per, min_periods=1)
+            else:
+                raise ValueError(f"Moving average {ma_type} not implemented.")
+            return averages
 
 
-        def _build_buffers(root_name:str) -> pd.DataFrame:
+        def _build_buffers_and_zones(emas: np.ndarray) -> tuple:
             """
-            Build EMA columns with buffers:
-            - Root name should be in the format 'EMA_period'.
+            Build EMA buffers and the zones in the same pass over the EMAs, for all periods:
             - Nomenclature:
                 - EMA_i_+ = EMA_i + buffer
                 - EMA_i_- = EMA_i - buffer
             REM: the buffer is a %age of the adjusted_close.
+            - Zone (int8 ZONE_CODES) where close is:
+                - Above buffer+ : ZONES[0] = High -> 1
+                - Beneath buffer- : ZONES[1] = Low -> -1
+                - In buffer zone: ZONES[2] = Mid -> 0
 
-            Args:
-                root_name (str): The root name for the EMA column (e.g., 'EMA_5').
-
-            Returns:
-                pd.DataFrame: DataFrame with EMA columns adjusted by the buffer.
-            """
-            # Instantiate a dataframe with the same date indices as the original dataframe
-            ts = pd.DataFrame(index = self._time_series.index)
-            if self._buffers['fixed']:
-                # Create the EMA column with the added buffer (EMA_i_+)
-                ts[f'{root_name}_+'] = (1 + self._buffers["buffer"]) * self._time_series[root_name]
-                # Create the EMA column with the subtracted buffer (EMA_i_-)
-                ts[f'{root_name}_-'] = (1 - self._buffers["buffer"]) * self._time_series[root_name]
-            else:
-                # Handle case where the buffer is not fixed
-                sys_util.terminate("3D OF not implemented", None, self.__class__, sys._getframe())
-            return ts
-
-
-        def _build_zone(period: int) -> pd.DataFrame:
-            """
-            Build zone column where close is:
-                - Above buffer+ : ZONES[0] = High
-                - Beneath buffer- : ZONES[1] = Low
-                - In buffer zone: ZONES[2] = Mid
-
-            Note: The zone column is strategy-independent and is built based on the
+            Note: The zone is strategy-independent and is built based on the
                   relationship between the adjusted close and the EMA with buffer.
 
             Args:
-                period (int): The period used for the EMA calculation.
-
-            Returns:
-                pd.DataFrame: DataFrame with the zone column.
-            """
-            ts = self._time_series
-            rec_frame = pd.DataFrame(index = ts.index)
-
-            # Define conditions for determining the zone
-            conditions = [(ts['adj_close'] >= ts[f'EMA_{period}_+']),
-                          (ts['adj_close'] <= ts[f'EMA_{period}_-']),
-                          ]
-            # Define corresponding zone options
-            options = [ZONES[0], ZONES[1]]
-            # If neither condition is met, assign Mid zone
-            rec_frame[f'Z_{period}'] = np.select(conditions, options, ZONES[2])
-            return rec_frame
-
-
-        def _build_position(period: int) -> pd.DataFrame:
-            """
-            Build the required position column based on the zone and strategy.
-
-            - Long position -> POSITIONS[0] = Long
-            - Short position -> POSITIONS[1] = Shrt
-            - Sideline -> POSITIONS[2] = Side
-
-            The position is determined based on whether the close price falls within the
-            defined zone and the specified strategy ('long' or 'short').
-
-            Args:
-                period (int): The period for which the position is being calculated.
-
-            Returns:
-                pd.DataFrame: DataFrame containing the position column.
-            """
-            ts = self._time_series
-            rec_frame = pd.DataFrame(index = ts.index)
-            # Define conditions for determining the position based on the zone
-            conditions = [(ts[f'Z_{period}'] == ZONES[0]),
-                          (ts[f'Z_{period}'] == ZONES[1]),
-                          ]
-            # Determine position options based on the strategy
-            if self._strategy == 'long':
-                options = [POSITIONS[0], POSITIONS[2]]  # Long or Sideline
-            elif self._strategy == 'short':
-                options = [POSITIONS[1], POSITIONS[2]]  # S~hort or Sideline
-            else:
-                raise ValueError(f"Strategy {self._strategy} not implemented.")
-            # Assign position values based on the conditions and strategy
-            rec_frame[f'Pos_{period}_{self._strategy}'] = np.select(conditions, options, '')
-            # Set first value to 'Sideline' (default state)
-            rec_frame.iat[0, 0] = POSITIONS[2]
-            # Loop over the rows to propagate the previous row's position where needed
-            for row in range(1, rec_frame.shape[0]):
-                if rec_frame.iat[row, 0] == '':
-                    rec_frame.iat[row, 0] = rec_frame.iat[row - 1, 0]
-            return rec_frame
-
-
-        def _build_recommendation(period: int) -> pd.DataFrame:
-            """
-            Build recommendation column based on the position column.
-            This is strategy-independent and provides recommendations for trading actions:
-            - Buy
-            - Sell
-            - Hold
-
-            Args:
-                period (int): The period for which the recommendation is being calculated.
+                emas (np.ndarray): The EMAs, one row per period.
 
             Returns:
-                pd.DataFrame: DataFrame containing the recommendation column.
+                tuple: The upper and lower buffers and the zone codes (not stored in the frame),
+                one row per period.
             """
-            ts = self._time_series  # Assuming _time_series is accessible in the context
-            rec_frame = pd.DataFrame(columns = [f'R_{period}_{self._strategy}'],
-                                     index = ts.index
-                                     )
-            # The first day is set to 'Hold' (no action taken)
-            rec_frame.iat[0, 0] = RECOMMENDATIONS[2]  # 'Hold' recommendation
-
-            long_pos_changes = [ # Logic for Long strategy
-                (POSITIONS[2], POSITIONS[0], RECOMMENDATIONS[0]),  # Side -> Long: Buy
-                (POSITIONS[2], POSITIONS[1], RECOMMENDATIONS[1]),  # Side -> Short: Sell
-                (POSITIONS[2], POSITIONS[2], RECOMMENDATIONS[2]),  # Side -> Side: Hold
-                (POSITIONS[1], POSITIONS[0], RECOMMENDATIONS[0]),  # Short -> Long: Buy
-                (POSITIONS[1], POSITIONS[1], RECOMMENDATIONS[2]),  # Short -> Short: Hold
-                (POSITIONS[1], POSITIONS[2], RECOMMENDATIONS[2]),  # Short -> Side: Hold
-                (POSITIONS[0], POSITIONS[0], RECOMMENDATIONS[2]),  # Long -> Long: Hold
-                (POSITIONS[0], POSITIONS[1], RECOMMENDATIONS[1]),  # Long -> Short: Sell
-                (POSITIONS[0], POSITIONS[2], RECOMMENDATIONS[1]),  # Long -> Side: Sell
-            ]
-
-            # Loop through the time series to build the recommendation
-            for row in range(1, rec_frame.shape[0]):
-                previous_pos = ts.loc[ts.index[row - 1], f'Pos_{period}_{self._strategy}']
-                current_pos = ts.loc[ts.index[row], f'Pos_{period}_{self._strategy}']
-
-                for prev, curr, rec in long_pos_changes:
-                    if previous_pos == prev and current_pos == curr:
-                        rec_frame.iat[row, 0] = rec
-                        break
-                else:
-                    raise ValueError(f"Logic error in recommendation calculation at row {row}")
-
-            # Shift recommendation 1 day (recommendation for the day after close)
-            rec_frame[f'R_{period}_{self._strategy}'] = rec_frame[f'R_{period}_{self._strategy}'].shift(1)
-
-            return rec_frame
-
-        # Loop through moving average periodicities:
-        for per in range(self._period_range['min'], self._period_range['max'] + 1):
-            if self._ema: # Exponential moving average
-                # Column names derive from root_name
-                root_name = f'EMA_{per}'
-
-                # Aggregate the exponential moving average column to existing dataframe
-                self._time_series = self._time_series.join(_build_moving_average(col_name = root_name,
-                                                                                 ma_type = MOVING_AVGS[0],
-                                                                                 per = per,
-                                                                                 ))
-                # Build buffers around moving average and aggregate
-                self._time_series = self._time_series.join(_build_buffers(root_name = root_name))
-                # Aggregate the zone column to existing dataframe
-                self._time_series = self._time_series.join(_build_zone(period = per))
-                #Aggregate the positio column to existing dataframe
-                self._time_series = self._time_series.join(_build_position(period = per))
-                #Build recommendation and aggregate
-                self._time_series = self._time_series.join(_build_recommendation(period = per))
-            if self._sma: # Simple moving average
-                col_name = f'SMA_{per}'
-                # Aggregate the simple moving average column to existing dataframe
-                self._time_series = self._time_series.join(_build_moving_average(col_name = col_name,
-                                                                                 ma_type = MOVING_AVGS[1],
-                                                                                 per = per))
-                col_name = f'EMA-SMA_{per}'
-                self._time_series = self._time_series.join(_build_ma_differential(col_name = col_name,
-                                                                                  per = per))
+            if not self._fixed_buffer:
+                # Handle case where the buffer is not fixed
+                sys_util.terminate("3D OF not implemented", None, self.__class__, sys._getframe())
+            upper = emas * DERIVED_DTYPE(1 + self._buffer)
+            lower = emas * DERIVED_DTYPE(1 - self._buffer)
+            # High above the upper buffer, else Low beneath the lower buffer, else Mid
+            zones = np.where(close >= upper, np.int8(ZONE_CODES[0]),
+                             np.where(close <= lower, np.int8(ZONE_CODES[1]), np.int8(ZONE_CODES[2])))
+            return upper, lower, zones
+
+
+        if self._ema: # Exponential moving averages, buffers, zones, positions and recommendations
+            emas = _build_moving_averages(ma_type = MOVING_AVGS[0])
+            uppers, lowers, zones = _build_buffers_and_zones(emas = emas)
+            positions, recommendations = _positions_and_recommendations(zones, self._strategy)
+            # Shift recommendation 1 day (recommendation for the day after close); code -1 is NaN
+            recommendations = np.concatenate((np.full((len(periods), 1), -1, dtype=np.int8),
+                                              recommendations[:, :-1]),
+                                             axis = 1)
+            recommendations.flags.writeable = False # shared with the objective function
+            self._recommendation_codes = recommendations
+        if self._sma: # Simple moving averages and EMA-SMA differentials
+            if not self._ema:
+                raise KeyError("EMA columns are missing for the EMA-SMA differentials.")
+            smas = _build_moving_averages(ma_type = MOVING_AVGS[1])
+            differentials = emas - smas
+
+        # Assemble the columns in period order
+        columns = {} # derived columns, name -> values, in insertion order
+        for row, per in enumerate(periods):
+            if self._ema:
+                columns[f'EMA_{per}'] = emas[row]
+                columns[f'EMA_{per}_+'] = uppers[row]
+                columns[f'EMA_{per}_-'] = lowers[row]
+                # Categorical columns: 1 byte per row instead of a Python string
+                columns[f'Pos_{per}_{self._strategy}'] = pd.Categorical.from_codes(positions[row], POSITIONS)
+                columns[f'R_{per}_{self._strategy}'] = pd.Categorical.from_codes(recommendations[row],
+                                                                                 RECOMMENDATIONS)
+            if self._sma:
+                columns[f'SMA_{per}'] = smas[row]
+                columns[f'EMA-SMA_{per}'] = differentials[row]
+        # Aggregate all derived columns to the existing dataframe in one go
+        self._time_series = pd.concat([self._time_series, pd.DataFrame(columns, index = index)], axis = 1)
 
 
     def _engineer(self):
@@ -387,36 +330,63 @@ class Frame:
         - volume scaled to close for ML
         """
         ts = self._time_series
+        # Medians computed once each with np.nanmedian (partition, O(N)) rather than sorting per feature
+        close_median = np.nanmedian(self._adj_close)
+        if close_median == 0:
+            sys_util.terminate("median adj_close is zero", ValueError("adj_close median is zero"),
+                               self.__class__, sys._getframe())
+        spread_median = np.nanmedian(ts['spread'].to_numpy(np.float64))
+        # Build scaled spread and volume columns
+        ts.loc[:, 'scaled_spread'] = ts['spread'].to_numpy() * (close_median / spread_median)
+        ts.loc[:, 'scaled_volume'] = ts['volume'].to_numpy() / close_median
+
+
+    def iter_reversed(self):
+        """
+        Iterate over the rows from the most recent to the oldest as (date, value, ...) tuples
+        in column order. Columns are walked through reversed array views: the dataframe
+        itself is not copied in reverse order.
+        """
+        ts = self._time_series
+        return zip(ts.index[::-1], *(ts[column].to_numpy()[::-1] for column in ts.columns))
 
-        def compute_scaled_feature(numerator, denominator, col_name, error_msg):
-            """Helper function to compute scaled features safely."""
-            median_num, median_den = ts[numerator].median(), ts[denominator].median()
-
-            if median_den == 0:
-                sys_util.terminate(error_msg, ValueError(f"{denominator} median is zero"), self.__class__, sys._getframe())
-
-            ts.loc[:, col_name] = ts[numerator] / median_den if "volume" in col_name else ts[numerator] * (median_den / median_num)
-        # Build a scaled spread column
-        compute_scaled_feature("spread", "adjusted_close", "scaled_spread", "median spread is zero")
-        compute_scaled_feature("volume", "adjusted_close", "scaled_volume", "median adjusted_close is zero")
-
-
-    def _cleanup(self):
-        """Remove unnecessary 'Z_*' columns from the dataframe."""
-        z_cols = [f'Z_{per}' for per in range(self._period_range['min'], self._period_range['max'] + 1)]
-        existing_cols = set(z_cols) & set(self._time_series.columns)
-
-        if existing_cols:
-            self._time_series.drop(columns=list(existing_cols), inplace=True)
-        else:
-            sys_util.warning(
-                f"Could not drop columns {z_cols} (some or all do not exist)",
-                KeyError(z_cols),
-                self.__class__,
-                getattr(self, '_cleanup', None)
-            )
 
+def _positions_and_recommendations(zone:np.ndarray, strategy:str) -> tuple:
+    """
+    Position / recommendation state machine on int8 codes.
 
-    def _reorder(self):
-        """Utility to reverse dataframe order (start-to-end)"""
-        self._time_series = self._time_series.iloc[::-1]
+    Input:
+        - zone: array of ZONE_CODES, one row per period (or a single 1-D series)
+        - strategy: 'long' or 'short'
+    Returns the (positions, recommendations) code arrays, indices in POSITIONS and RECOMMENDATIONS.
+    The position is entered in the High zone, Side in the Low zone and carried over in the Mid zone.
+    """
+    if strategy == 'long':
+        held = 0 # Long
+    elif strategy == 'short':
+        held = 1 # Short
+    else:
+        raise ValueError(f"Strategy {strategy} not implemented.")
+    # Position code per zone code: Mid (0) -> -1 (carried over), High (1) -> held, Low (-1) -> Side
+    positions = np.array([-1, held, 2], dtype=np.int8)[zone]
+    positions[..., 0] = 2 # Side is the default state
+    # Forward-fill the Mid zone (-1) with the index of the last day that set a position
+    days = np.broadcast_to(np.arange(positions.shape[-1]), positions.shape)
+    last_set = np.maximum.accumulate(np.where(positions >= 0, days, 0), axis=-1)
+    positions = np.take_along_axis(positions, last_set, axis=-1)
+
+    # Recommendation for each previous -> current position transition (see TRANSITIONS)
+    previous = np.concatenate((np.full_like(positions[..., :1], 2), positions[..., :-1]), axis=-1)
+    recommendations = TRANSITIONS[previous, positions]
+    return positions, recommendations
+
+
+def _cumulative_return(returns:np.ndarray) -> np.ndarray:
+    """
+    Cumulative product of (1 + returns), skipping NaN returns which stay NaN in the result
+    (same as pandas cumprod with skipna)
+    """
+    missing = np.isnan(returns)
+    cumulative = np.multiply.accumulate(np.where(missing, 1., 1. + returns))
+    cumulative[missing] = np.nan
+    return cumulative
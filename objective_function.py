@@ -11,13 +11,11 @@ An optimal parameter is determined by exhaustive exploration but maxima are also
 the uniqueness (ie: stability) of the optimal solution.
 
 """
-import sys
 import pandas as pd
 import numpy as np
 import config
 import frame
 import request
-import utilities.system_utilities as sys_util
 import utilities.time_utilities as time_util
 import utilities.io_utilities as io_util
 
@@ -33,9 +31,9 @@ class ObjectiveFunction:
         self._data_frame = self._frame_obj.get_data_frame() # time series in Frame object
         self._config = conf
         self._req = req
-        self._strategy = self._config.get_strategy()
-        self._period = self._config.get_periods()
-        self._debug = conf.get_debug()
+        self._strategy = self._config.strategy
+        self._period = self._config.periods
+        self._debug = conf.debug
         # Set various configuration parameters as variables
         self._o_function = None # Objective function
         self._max_df = None # Dataframe of local maxima in _o_function < 1 sdev from max
@@ -44,21 +42,23 @@ class ObjectiveFunction:
         self._n_local_max = None  # number of local maxima
         self._nmax_1std = None  # number of local maxima 1 standard deviation from global max (incl. global max)
         self._std_of_local_max = None  # Standard deviation of local maxima
-        self._build_objective_function()
-        self._build_maxima()
-        self._extract_max()
+        self._local_max_rows = None  # row positions of the local maxima in _o_function
+        self._built = False # the objective function is built on first access
 
     #--- GETTERS ---#
     def get_objective_function(self):
+        self._build()
         return self._o_function
 
 
     def get_local_maxima(self):
+        self._build()
         return self._max_df
 
 
     def get_of_info(self) -> dict:
-        return {'period_at_global_max': self._period_at_global_max,
+        self._build()
+        return {'period_at_global_max': self._global_max_periods,
                 'global_max': self._global_max,
                 'std_of_local_max': self._std_of_local_max,
                 'number_of_periods': self._period['max'] - self._period['min'] + 1,
@@ -69,113 +69,136 @@ class ObjectiveFunction:
 
     def get_global_max(self):
         """Return period at global max and global max as a tuple"""
+        self._build()
         return self._global_max_periods, self._global_max
 
 
     #--- CONSTRUCTORS ---#
+    def _build(self):
+        """
+        Build the objective function and its maxima on first access only:
+        runs that never read the objective function (e.g. plots turned off) skip the sweep.
+        """
+        if self._built:
+            return
+        self._build_objective_function()
+        self._build_maxima()
+        self._extract_max()
+        self._built = True
+
+
     @time_util.timing_decorator
     def _build_objective_function(self):
         """
         Builds the objective function from the data frame and the strategy
         So far only a long strategy is considered
         """
-        #--- method utility ---#
-        def _sum_tx(df:pd.DataFrame, col:str):
-            """Return the value of buys and sells"""
-            buys = df.loc[df[col] == 'B', 'adj_close'].sum()
-            sells = df.loc[df[col] == 'S', 'adj_close'].sum()
-            # Count number of 'B' & 'S' & adds the value of the day's close if nB != nS
-            if (df[col] == "B").sum() == (df[col] == "S").sum() + 1:
-                # If more B than S (long), use today's close as last value for S
-                sells += df["adj_close"].iloc[-1]
-            elif (df[col] == "B").sum() + 1 == (df[col] == "S").sum():
-                # If more S than B (short), use today's close as last value for B
-                buys += df["adj_close"].iloc[-1]
-            return buys, sells
-        # _build_objective_function() starts here
-        of_list = [
-            (per,
-                (_sum_tx(self._data_frame, f"R_{per}_{self._strategy}")[1] -
-                 _sum_tx(self._data_frame, f"R_{per}_{self._strategy}")[0]
-                ) / self._data_frame.loc[self._data_frame[f"R_{per}_{self._strategy}"] == "B", "adj_close"].iloc[0],
-            )
-            for per in range(self._period["min"], self._period["max"] + 1)
-        ]
-        # Build the objective function DataFrame from the list of lists
-        self._o_function = pd.DataFrame(of_list, columns = OF_COLUMNS).set_index(OF_COLUMNS[0])
+        close = self._data_frame['adj_close'].to_numpy(np.float64)
+        periods = np.arange(self._period["min"], self._period["max"] + 1)
+        # Recommendation codes of all periods, one row per period: [P, N] int8
+        codes = self._frame_obj.get_recommendation_codes()
+        if codes is None:
+            raise KeyError(f"No recommendation columns R_*_{self._strategy} (EMA is off).")
+        self._o_function = pd.DataFrame({OF_COLUMNS[1]: compute_gains(codes, close)},
+                                        index = pd.Index(periods, name = OF_COLUMNS[0]))
 
 
     def _build_maxima(self):
-        """Build local max column from gains column, including edge cases (including plateaus)."""
-        gains_col = self._o_function["gains"].values
-        maxima = np.zeros_like(gains_col, dtype=bool)
-
-        # Check internal local maxima, including plateaus
-        for i in range(1, len(gains_col) - 1):
-            if gains_col[i] > gains_col[i - 1] and gains_col[i] > gains_col[i + 1]:
-                maxima[i] = True
-            elif gains_col[i] == gains_col[i + 1]:  # Start of a plateau
-                j = i
-                while j < len(gains_col) - 1 and gains_col[j] == gains_col[j + 1]:
-                    j += 1
-                # If plateau is higher than neighbors, mark all values in plateau as max
-                if (i > 0 and gains_col[i] > gains_col[i - 1]) and (j < len(gains_col) - 1 and gains_col[j] > gains_col[j + 1]):
-                    maxima[i:j+1] = True
-
-        # Check edges
-        if len(gains_col) > 1:
-            if gains_col[0] > gains_col[1]:  # First element
-                maxima[0] = True
-            if gains_col[-1] > gains_col[-2]:  # Last element
-                maxima[-1] = True
-
-        # Assign results
-        self._o_function["max"] = np.where(maxima, gains_col, np.nan)
-
+        """
+        Build local max column from gains column, including edge cases (including plateaus).
+        The gains are split into runs of equal values: a run (single value or plateau) is a
+        local max when it is higher than both its neighbors; the first and last values are
+        compared to their only neighbor.
+        """
+        gains_col = self._o_function["gains"].to_numpy(dtype=np.float64, copy=False)
+        n_gains = len(gains_col)
+        maxima = np.zeros(n_gains, dtype=bool)
+
+        if n_gains > 1:
+            # Runs of equal values: start and end positions
+            starts = np.flatnonzero(np.concatenate(([True], gains_col[1:] != gains_col[:-1])))
+            ends = np.append(starts[1:], n_gains) - 1
+            # Internal runs higher than the previous and the next value
+            internal = (starts > 0) & (ends < n_gains - 1)
+            peak = np.zeros(len(starts), dtype=bool)
+            peak[internal] = ((gains_col[starts[internal]] > gains_col[starts[internal] - 1])
+                              & (gains_col[ends[internal]] > gains_col[ends[internal] + 1]))
+            maxima = np.repeat(peak, ends - starts + 1)
+            # Check edges
+            maxima[0] |= gains_col[0] > gains_col[1]  # First element
+            maxima[-1] |= gains_col[-1] > gains_col[-2]  # Last element
+
+        # Row positions of the local maxima in the objective function
+        self._local_max_rows = np.flatnonzero(maxima)
 
 
     def _extract_max(self):
         """Extract global maxima and statistics for local maxima, ensuring periods are stored as integers."""
-        # Rename the 'max' column to avoid conflict with the built-in function 'max'
-        max_df = self._o_function.dropna(subset=["max"]).copy()
-        max_df.rename(columns={"max": "max_column"}, inplace=True)
+        # Periods and gains of the local maxima
+        periods = self._o_function.index.to_numpy()[self._local_max_rows].astype(int)
+        gains = self._o_function["gains"].to_numpy(dtype=np.float64)[self._local_max_rows]
         if self._debug:
-            print(f'max_df is:\n{max_df}')
+            print(f'local maxima are:\n{pd.Series(gains, index=periods, name="max")}')
 
-        # Compute standard deviation and global maximum value
-        self._std_of_local_max = max_df["max_column"].std()
-        self._global_max = max_df["max_column"].max()
+        # Compute standard deviation (sample, as pandas) and global maximum value; NaN if undefined
+        self._std_of_local_max = gains.std(ddof=1) if len(gains) > 1 else np.nan
+        self._global_max = gains.max() if len(gains) > 0 else np.nan
 
         # Find all periods where gains match the global max store them as integers
-        self._global_max_periods = [int(period) for period in max_df[max_df["max_column"] == self._global_max].index]
+        self._global_max_periods = periods[gains == self._global_max].tolist()
 
-        # Filter local maxima within 1 standard deviation of the global max and ensure integer indices
-        self._max_df = max_df[max_df["max_column"] > self._global_max - self._std_of_local_max].copy()
-        self._max_df.index = self._max_df.index.astype(int)  # Ensure period indices are integers
+        # Filter local maxima within 1 standard deviation of the global max
+        within = gains > self._global_max - self._std_of_local_max
+        self._max_df = pd.DataFrame({"gains": gains[within], "max": gains[within]},
+                                    index=pd.Index(periods[within], name=self._o_function.index.name))
 
         # Count the number of local maxima
-        self._n_local_max = len(max_df)
-        self._nmax_1std = len(self._max_df)
-
-        # Rename the column back for consistency
-        self._max_df.loc[:, "max"] = self._max_df["max_column"]
-        self._max_df.drop("max_column", axis=1, inplace=True)
-
-
-
-    #--- POST-PROCESSING ---#
-    def _cleanup(self):
-        """Remove max column"""
-        try:
-            self._o_function.drop(['max'], axis = 1, inplace = True)
-        except BaseException as e:
-            sys_util.terminate('No column "max" in DataFrame ',
-                               e, self.__class__.__name__, sys._getframe()
-                               )
+        self._n_local_max = len(gains)
+        self._nmax_1std = int(within.sum())
 
 
     #--- I/O ---#
     def save_data(self, directory:str):
         """Save data to csv file"""
+        self._build()
         prefix = f'{self._req.get_ticker()}_of'
-        io_util.dataframe_to_csv(self._o_function, self._config.get_config_parameters()['data_dir'], prefix)
+        io_util.dataframe_to_csv(self._o_function, self._config.data_dir, prefix)
+
+
+def compute_gains(codes:np.ndarray, close:np.ndarray) -> np.ndarray:
+    """
+    Gains of the recommendations of every period, relative to the close of the first buy.
+
+    Args:
+        codes (np.ndarray): [..., P, N] recommendation codes (indices in frame.RECOMMENDATIONS),
+            one row per period.
+        close (np.ndarray): [..., N] adjusted close.
+
+    Returns:
+        np.ndarray: [..., P] gains (float64).
+
+    Leading axes are batch axes: tickers (or strategies) aligned on the same N dates can be
+    stacked as [T, P, N] codes and [T, N] closes and evaluated in a single call.
+    """
+    # Sums of prices and gains in float64 (prices may be stored as float32): float32 rounding
+    # can make neighbouring periods compare equal and create spurious plateaus in the maxima
+    close = np.asarray(close, dtype=np.float64)[..., None, :] # broadcast over the periods
+    is_b = codes == frame.RECOMMENDATIONS.index('B')
+    is_s = codes == frame.RECOMMENDATIONS.index('S')
+    # Value of buys and sells for all periods
+    buys = np.where(is_b, close, 0).sum(axis = -1)
+    sells = np.where(is_s, close, 0).sum(axis = -1)
+    n_buys = is_b.sum(axis = -1)
+    n_sells = is_s.sum(axis = -1)
+    # Adds the value of the day's close if nB != nS
+    last_close = close[..., -1]
+    # If more B than S (long), use today's close as last value for S
+    sells = np.where(n_buys == n_sells + 1, sells + last_close, sells)
+    # If more S than B (short), use today's close as last value for B
+    buys = np.where(n_buys + 1 == n_sells, buys + last_close, buys)
+    # Gains are relative to the close of the first buy
+    if not is_b.any(axis = -1).all():
+        raise IndexError("No buy recommendation for some periods.")
+    first_buy = np.take_along_axis(np.broadcast_to(close, is_b.shape),
+                                   is_b.argmax(axis = -1)[..., None], axis = -1)[..., 0]
+    return (sells - buys) / first_buy
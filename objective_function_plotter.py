@@ -6,6 +6,7 @@
 Plotter class for the objective function
 """
 import sys
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import inspect
@@ -16,29 +17,29 @@ import utilities.system_utilities as sys_util
 import utilities.io_utilities as io_util
 from plotter import Plotter
 
+WEBGL_THRESHOLD = 1000 # default number of periods above which the objective function is drawn with WebGL
+
 class ObjectiveFunctionPlotter(Plotter):
     def __init__(self, conf:config.Config, req:request.Request, of:obj_func.ObjectiveFunction):
         super().__init__(conf=conf, req=req)
         self._of = of
         self._plot_type = 'of_plot'
-        self._debug = conf.get_debug()
+        self._debug = conf.debug
         self._trace = {} # objective function trace
         self._local = {} # local maxima markers
 
 
     def _extract_title_data(self):
-            """Extract plot title information to build the title text"""
-            # Get actual date range and convert values to string
-            info = self._req.get_company_info()
-            title = f'{info["name"]} '
-            title += f'({self._req.get_ticker()} | {info["exchange"]})<br>'
-            title += f'{self._of.get_global_max()[0]} days | {self._of.get_global_max()[1]:.1%} returns '
-            title += f'({self._get_daterange()["start_date"]} -> {self._get_daterange()["end_date"]})'
-            return (
-                f"{info['name']} ({self._req.get_ticker()} | {info['exchange']})<br>"
-                f"{self._of.get_global_max()[0]} days | {self._of.get_global_max()[1]:.1%} returns "
-                f"({self._get_daterange()['start_date']} -> {self._get_daterange()['end_date']})"
-            )
+        """Extract plot title information to build the title text"""
+        # Get actual date range and convert values to string
+        info = self._req.get_company_info()
+        periods, gains = self._of.get_global_max()
+        daterange = self._get_daterange()
+        return (
+            f"{info['name']} ({self._req.get_ticker()} | {info['exchange']})<br>"
+            f"{periods} days | {gains:.1%} returns "
+            f"({daterange['start_date']} -> {daterange['end_date']})"
+        )
 
 
     def _extract_trace(self):
@@ -67,38 +68,52 @@ class ObjectiveFunctionPlotter(Plotter):
             self._extract_global_max()
 
             # Merge periods from trace and local maxima
-            trace_periods = set(self._trace["period"])
-            local_periods = set(self._local["period"])
-            all_periods = sorted(trace_periods.union(local_periods))
-
-            # Initialize colors with the default trace color
-            colors = [self._config[self._plot_type]["trace"]["color"]] * len(all_periods)
-            # Create a set to track updated periods
-            updated_periods = set()
-
-            # Assign local minima colors
-            for period in self._local["period"]:
-                if period not in updated_periods:
-                    index = all_periods.index(period)
-                    colors[index] = self._config[self._plot_type]["markers"]["local-color"]
-                    updated_periods.add(period)
-
-            # Assign global maximum color
-            for global_period in self._global:
-                if global_period in all_periods:  # Check to prevent errors
-                    index = all_periods.index(global_period)
-                    colors[index] = self._config[self._plot_type]['markers']['global-color']
-                    updated_periods.add(global_period)
-
-            figure.add_trace(
-                go.Bar(x=all_periods,
-                       y=self._trace["gains"],
-                       name="objective function",
-                       marker_color=colors,
-                       marker_line_color=self._config[self._plot_type]["trace"]["line_color"],
-                       marker_line_width=self._config[self._plot_type]["trace"]["line_width"],
-                       opacity=self._config[self._plot_type]["trace"]["opacity"],
-                       ))
+            all_periods = np.unique(np.concatenate((np.asarray(self._trace["period"]),
+                                                    np.asarray(self._local["period"]))))
+            period_to_index = {period: index for index, period in enumerate(all_periods.tolist())}
+
+            # Color category per bar: 0 = trace, 1 = local max, 2 = global max (takes precedence)
+            category = np.zeros(len(all_periods), dtype=np.int8)
+            category[[period_to_index[period] for period in self._local["period"]]] = 1
+            category[[period_to_index[period] for period in self._global
+                      if period in period_to_index]] = 2  # Check to prevent errors
+            palette = np.array([self._config[self._plot_type]["trace"]["color"],
+                                self._config[self._plot_type]["markers"]["local-color"],
+                                self._config[self._plot_type]["markers"]["global-color"]])
+            colors = palette[category].tolist()
+
+            if len(all_periods) <= self._config[self._plot_type].get("webgl_threshold", WEBGL_THRESHOLD):
+                figure.add_trace(
+                    go.Bar(x=all_periods,
+                           y=self._trace["gains"],
+                           name="objective function",
+                           marker_color=colors,
+                           marker_line_color=self._config[self._plot_type]["trace"]["line_color"],
+                           marker_line_width=self._config[self._plot_type]["trace"]["line_width"],
+                           opacity=self._config[self._plot_type]["trace"]["opacity"],
+                           ))
+            else: # Too many bars for SVG: WebGL filled line with markers at the maxima only
+                figure.add_trace(
+                    go.Scattergl(x=all_periods,
+                                 y=self._trace["gains"],
+                                 name="objective function",
+                                 mode="lines",
+                                 fill="tozeroy",
+                                 fillcolor=self._config[self._plot_type]["trace"]["color"],
+                                 line={"color": self._config[self._plot_type]["trace"]["line_color"],
+                                       "width": self._config[self._plot_type]["trace"]["line_width"]},
+                                 opacity=self._config[self._plot_type]["trace"]["opacity"],
+                                 ))
+                maxima = np.flatnonzero(category)
+                figure.add_trace(
+                    go.Scattergl(x=all_periods[maxima],
+                                 y=np.asarray(self._trace["gains"])[maxima],
+                                 name="maxima",
+                                 mode="markers",
+                                 marker={"color": palette[category[maxima]].tolist(),
+                                         "size": self._config[self._plot_type]["markers"]["size"],
+                                         "line_width": self._config[self._plot_type]["markers"]["line_width"]},
+                                 ))
             figure.update_layout(yaxis_tickformat=".1%")
 
         #--- plot() starts here ---#
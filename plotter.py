@@ -16,6 +16,7 @@ class Plotter:
     def __init__(self, conf:config.Config, req:request.Request):
         self._config = conf.get_config_parameters()
         self._req = req
+        self._daterange = None # formatted actual dates, built on first use
 
 
     def _build_title(self, figure: go.Figure, axis_titles: dict):
@@ -63,9 +64,11 @@ class Plotter:
 
 
     def _get_daterange(self):
-        """Return a dictionary with actual start & end dates"""
-        dates = self._req.get_dates('actual')
-        return {
-            key: date.strftime(self._config["date_format"])
-            for key, date in dates.items()
-        }
+        """Return a dictionary with actual start & end dates (formatted once per plotter)"""
+        if self._daterange is None:
+            dates = self._req.get_dates('actual')
+            self._daterange = {
+                key: date.strftime(self._config["date_format"])
+                for key, date in dates.items()
+            }
+        return self._daterange
@@ -13,9 +13,20 @@ NB: - actual start and end dates returned from finance server
     - all dates are stored in datetime format
 """
 import sys
+import types
 from datetime import datetime
 import config
 import utilities.system_utilities as sys_util
+import utilities.time_utilities as time_util
+
+# Display symbols by currency code (other currencies are displayed by their code)
+CURRENCY_SYMBOLS = types.MappingProxyType({"USD": "US $",
+                                           "EUR": "€",
+                                           "GBP": "£",
+                                           "YEN": "¥",
+                                           })
+
+DATE_TYPES = frozenset({"requested", "actual"}) # date ranges stored by a Request
 
 
 class Request:
@@ -24,20 +35,23 @@ class Request:
         - the ticker requested
         - requested start and end dates
     """
+    __slots__ = ('_date_format', '_parse_date', '_ticker', '_company_info',
+                 '_requested_dates', '_actual_dates')
 
     def __init__(self, conf: config.Config, ticker: str, start: datetime, end: datetime):
-        self._date_format = conf.get_date_format()
+        self._date_format = conf.date_format
+        self._parse_date = time_util.date_parser(self._date_format) # memoized, shared per format
+        self._ticker = ticker
         self._company_info = {"ticker": ticker}
-        self._date_range = {
-            "requested": {"start_date": start, "end_date": end},
-            "actual": {},
-        }
+        # Date ranges stored directly (no outer {date type: range} dict)
+        self._requested_dates = {"start_date": start, "end_date": end}
+        self._actual_dates = {}
 
 
     # --- GETTERS ---#
     def get_ticker(self):
         """Getter for the requested ticker symbol"""
-        return self._company_info.get("ticker")
+        return self._ticker
 
 
     def get_company_info(self):
@@ -47,9 +61,10 @@ class Request:
 
     def get_dates(self, date_type: str):
         """Getter for start & end - 'actual' and 'requested' dates"""
-        if date_type.lower() not in ["requested", "actual"]:
+        key = date_type if date_type in DATE_TYPES else date_type.lower() # callers pass the literals
+        if key not in DATE_TYPES:
             raise ValueError(f"date type {date_type} should be 'requested' or 'actual'")
-        return self._date_range[date_type.lower()]
+        return self._requested_dates if key == "requested" else self._actual_dates
 
 
     # --- SETTERS ---#
@@ -60,11 +75,9 @@ class Request:
                 ["start_date", "end_date"], [start_date, end_date]
             ):
                 if isinstance(date_value, datetime):
-                    self._date_range["actual"][date_type] = date_value
+                    self._actual_dates[date_type] = date_value
                 elif isinstance(date_value, str):
-                    self._date_range["actual"][date_type] = datetime.strptime(
-                        date_value, self._date_format
-                    )
+                    self._actual_dates[date_type] = self._parse_date(date_value)
                 else:
                     raise TypeError(
                         f"{date_type} {date_value} ({type(date_value)}) must be a datetime or str object"
@@ -91,12 +104,7 @@ class Request:
 
     def _set_company_currency_symbol(self):
         """Setter for company currency symbol"""
-        currency_symbols = {"USD": "US $",
-                            "EUR": "€",
-                            "GBP": "£",
-                            "YEN": "¥",
-                            }
-        self._company_info["currency-symbol"] = currency_symbols.get(
+        self._company_info["currency-symbol"] = CURRENCY_SYMBOLS.get(
             self._company_info["currency"], self._company_info["currency"]
         )
 
@@ -1,16 +1,23 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from alpha_vantage.timeseries import TimeSeries
+import utilities.moving_average_utilities as ma_util
+import utilities.io_utilities as io_util
 
 
 class MADAnalysis:
-    def __init__(self, ticker, start_date, end_date, api_key):
+    def __init__(self, ticker, start_date, end_date, api_key, cache_dir=".av_cache"):
         """
         Initialize the MADAnalysis class with a stock ticker, date range, and Alpha Vantage API key.
+        Downloaded histories are cached in cache_dir for the day (None: no cache).
         """
         self.ticker = ticker
+        self.cache_dir = cache_dir
         self.start_date = pd.to_datetime(start_date)
         self.end_date = pd.to_datetime(end_date)
         self.api_key = api_key
@@ -22,20 +29,30 @@ class MADAnalysis:
         """
         Download historical stock data using Alpha Vantage.
         Alpha Vantage provides data in the form of a dictionary. We will retrieve the adjusted close prices.
+        The full history is cached on disk (parquet) under the ticker and today's date: reruns
+        on the same day, for any date range, do not call the API (25 calls/day on the free tier).
         """
-        ts = TimeSeries(key=self.api_key, output_format="pandas")
-        # Fetch the daily adjusted stock price data
-        data, _ = ts.get_daily_adjusted(symbol=self.ticker, outputsize="full")
-
-        # Keep only the adjusted close price
-        self.data = data[["5. adjusted close"]].rename(
-            columns={"5. adjusted close": "Close"}
-        )
-
-        # Convert index to datetime and filter by start and end dates
-        self.data.index = pd.to_datetime(self.data.index)
-        self.data = self.data[
-            (self.data.index >= self.start_date) & (self.data.index <= self.end_date)
+        cache_prefix = f"{self.ticker}_daily_adjusted_{date.today().isoformat()}"
+        history = None
+        if self.cache_dir is not None:
+            history = io_util.load_parquet_file(self.cache_dir, cache_prefix)
+        if history is None:
+            ts = TimeSeries(key=self.api_key, output_format="pandas")
+            # Fetch the daily adjusted stock price data
+            data, _ = ts.get_daily_adjusted(symbol=self.ticker, outputsize="full")
+
+            # Keep only the adjusted close price
+            history = data[["5. adjusted close"]].rename(
+                columns={"5. adjusted close": "Close"}
+            )
+            # Convert index to datetime
+            history.index = pd.to_datetime(history.index)
+            if self.cache_dir is not None:
+                io_util.dataframe_to_parquet(history, self.cache_dir, cache_prefix)
+
+        # Filter by start and end dates
+        self.data = history[
+            (history.index >= self.start_date) & (history.index <= self.end_date)
         ]
 
         return self.data
@@ -57,10 +74,15 @@ class MADAnalysis:
     def calculate_all_mad(self, windows=[50, 100, 200]):
         """
         Calculate MAD for a list of moving average windows.
+        All MA and MAD columns are built first and added to the data in a single assign.
         """
+        close = self.data["Close"].to_numpy(np.float64)
+        cum_close = ma_util.cumulative_sum(close) # shared by all windows: O(N) per window
+        columns = {}
         for window in windows:
-            self.calculate_moving_average(window)
-            self.calculate_mad(window)
+            columns[f"MA_{window}"] = ma_util.simple_moving_average(cum_close, window)
+            columns[f"MAD_{window}"] = close - columns[f"MA_{window}"]
+        self.data = self.data.assign(**columns)
 
     def plot_mad(self):
         """
@@ -139,6 +161,16 @@ class MADAnalysis:
         fig.show()
 
 
+def download_all(analyses, max_workers=4):
+    """
+    Download the data of several MADAnalysis objects (one per ticker) concurrently.
+    Alpha Vantage has no bulk daily endpoint: the per-ticker requests are overlapped
+    on a thread pool instead; max_workers bounds the concurrent calls (API rate limit).
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda analysis: analysis.download_data(), analyses))
+
+
 if __name__ == "__main__":
     """_summary_
     """
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_vectorized.py
+
+Regression checks of the vectorized kernels against the pandas / row-by-row
+implementations they replaced. Run as a script (python test_vectorized.py) or with pytest.
+"""
+import numpy as np
+import pandas as pd
+import frame
+import objective_function
+import utilities.moving_average_utilities as ma_util
+
+SEEDS = range(5)
+N_DAYS = 500
+
+
+def _random_close(seed:int, n_days:int = N_DAYS) -> np.ndarray:
+    """Random walk of adjusted closes"""
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n_days)))
+
+
+#--- MOVING AVERAGES ---#
+def test_exponential_moving_average():
+    """lfilter EMA vs pandas ewm(adjust=False)"""
+    for seed in SEEDS:
+        close = _random_close(seed)
+        for span in (1, 2, 5, 21, 200, 2 * N_DAYS):
+            expected = pd.Series(close).ewm(span=span, adjust=False).mean().to_numpy()
+            np.testing.assert_allclose(ma_util.exponential_moving_average(close, span),
+                                       expected, rtol=1e-12)
+    # Empty series: empty result, as pandas
+    empty = ma_util.exponential_moving_average(np.empty(0), 21)
+    assert empty.shape == (0,) and empty.dtype == np.float64
+
+
+def test_simple_moving_average():
+    """cumsum SMA vs pandas rolling().mean(), including windows longer than the series"""
+    for seed in SEEDS:
+        close = _random_close(seed)
+        cum_close = ma_util.cumulative_sum(close)
+        for window in (1, 2, 5, 21, 200, N_DAYS, N_DAYS + 1, 2 * N_DAYS):
+            for min_periods in (None, 1):
+                expected = pd.Series(close).rolling(window=window, min_periods=min_periods).mean()
+                np.testing.assert_allclose(ma_util.simple_moving_average(cum_close, window, min_periods),
+                                           expected.to_numpy(), rtol=1e-9, equal_nan=True)
+    assert ma_util.simple_moving_average(ma_util.cumulative_sum(np.empty(0)), 21).shape == (0,)
+
+
+#--- POSITIONS & RECOMMENDATIONS ---#
+def _reference_positions_and_recommendations(zones:list, strategy:str) -> tuple:
+    """Row-by-row position / recommendation state machine on labels (replaced by TRANSITIONS)"""
+    long_short, side = frame.POSITIONS[0 if strategy == 'long' else 1], frame.POSITIONS[2]
+    positions = [side] # Side is the default state
+    for zone in zones[1:]:
+        if zone == frame.ZONES[0]:
+            positions.append(long_short)
+        elif zone == frame.ZONES[1]:
+            positions.append(side)
+        else: # Mid: previous position carried over
+            positions.append(positions[-1])
+    buy, sell, hold = frame.RECOMMENDATIONS
+    pos_changes = {('Side', 'Long'): buy, ('Side', 'Short'): sell, ('Side', 'Side'): hold,
+                   ('Short', 'Long'): buy, ('Short', 'Short'): hold, ('Short', 'Side'): hold,
+                   ('Long', 'Long'): hold, ('Long', 'Short'): sell, ('Long', 'Side'): sell,
+                   }
+    recommendations = [hold] + [pos_changes[previous, current]
+                                for previous, current in zip(positions[:-1], positions[1:])]
+    return positions, recommendations
+
+
+def test_positions_and_recommendations():
+    """Transition table vs the row-by-row loop, one period per row and a single series"""
+    for seed in SEEDS:
+        rng = np.random.default_rng(seed)
+        zone = rng.choice(np.array(frame.ZONE_CODES, dtype=np.int8), size=(4, N_DAYS))
+        zone[1, :50] = 0 # Mid zone from the first day
+        zone[2, 1:] = 1 # always High
+        for strategy in ('long', 'short'):
+            positions, recommendations = frame._positions_and_recommendations(zone, strategy)
+            single = frame._positions_and_recommendations(zone[0], strategy)
+            np.testing.assert_array_equal(single[0], positions[0])
+            np.testing.assert_array_equal(single[1], recommendations[0])
+            for row in range(zone.shape[0]):
+                zones = [frame.ZONES[frame.ZONE_CODES.index(code)] for code in zone[row]]
+                expected = _reference_positions_and_recommendations(zones, strategy)
+                assert [frame.POSITIONS[code] for code in positions[row]] == expected[0]
+                assert [frame.RECOMMENDATIONS[code] for code in recommendations[row]] == expected[1]
+
+
+#--- OBJECTIVE FUNCTION MAXIMA ---#
+def _reference_local_max_rows(gains:np.ndarray) -> np.ndarray:
+    """Loop-based local maxima scan, including plateaus and edges (replaced by the run-based scan)"""
+    maxima = np.zeros_like(gains, dtype=bool)
+    for i in range(1, len(gains) - 1):
+        if gains[i] > gains[i - 1] and gains[i] > gains[i + 1]:
+            maxima[i] = True
+        elif gains[i] == gains[i + 1]: # Start of a plateau
+            j = i
+            while j < len(gains) - 1 and gains[j] == gains[j + 1]:
+                j += 1
+            if gains[i] > gains[i - 1] and j < len(gains) - 1 and gains[j] > gains[j + 1]:
+                maxima[i:j + 1] = True
+    if len(gains) > 1:
+        maxima[0] |= gains[0] > gains[1]
+        maxima[-1] |= gains[-1] > gains[-2]
+    return np.flatnonzero(maxima)
+
+
+def _local_max_rows(gains:np.ndarray) -> np.ndarray:
+    """Local maxima rows from ObjectiveFunction._build_maxima on a bare objective function"""
+    o_function = objective_function.ObjectiveFunction.__new__(objective_function.ObjectiveFunction)
+    o_function._o_function = pd.DataFrame({'gains': gains},
+                                          index=pd.Index(np.arange(len(gains)), name='period'))
+    o_function._build_maxima()
+    return o_function._local_max_rows
+
+
+def test_build_maxima():
+    """Run-based maxima vs the loop on plateaus and edges"""
+    cases = [[], [1.], [1., 1.], [1., 2.], [2., 1.],
+             [1., 3., 3., 2.], # internal plateau
+             [3., 3., 1.], [1., 3., 3.], [3., 3., 3.], # plateaus on the edges
+             [1., 3., 3., 4.], [4., 3., 3., 1.], # shoulders
+             [1., 2., 2., 1., 2., 2., 2., 1.], # two plateaus
+             [2., 1., 2., 1., 2.], # edges & single values
+             ]
+    rng = np.random.default_rng(0)
+    cases += [rng.integers(0, 4, size).astype(float) for size in (3, 10, 60, 500) for _ in range(20)]
+    for gains in cases:
+        gains = np.asarray(gains, dtype=np.float64)
+        np.testing.assert_array_equal(_local_max_rows(gains), _reference_local_max_rows(gains))
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_') and callable(check):
+            check()
+            print(f'{name}: ok')
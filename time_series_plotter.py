@@ -22,18 +22,20 @@ class TimeSeriesPlotter(Plotter):
         self._data_frame = frm.get_data_frame()
         self._plot_type = 'ts_plot'
         self._period = of.get_global_max()[0]
-        self._debug = conf.get_debug()
+        self._debug = conf.debug
+        self._plot_config = self._config[self._plot_type] # time series plot parameters, looked up once
+        self._dates = self._data_frame.index.to_numpy() # x axis of all traces, as a datetime64 array
 
 
     def _build_close(self, figure: go.Figure):
         """Builds the adjusted close trace"""
         figure.add_trace(go.Scatter(
-            x = self._data_frame.index,
-            y = self._data_frame['adj_close'],
+            x = self._dates,
+            y = self._data_frame['adj_close'].to_numpy(),
             mode = 'lines',
             name = 'adjusted close',
-            line = {'color': self._config[self._plot_type]['trace']['color'],
-                    'width': self._config[self._plot_type]['trace']['width'],
+            line = {'color': self._plot_config['trace']['color'],
+                    'width': self._plot_config['trace']['width'],
                     },
             connectgaps = True,
             ))
@@ -49,13 +51,14 @@ class TimeSeriesPlotter(Plotter):
         assert ma_type in {"ema", "sma"}, (
             f"Invalid ma_type '{ma_type}'. Expected 'ema' or 'sma'."
         )
+        ma_config = self._plot_config[ma_type]
         figure.add_trace(go.Scatter(
-            x = self._data_frame.index,
-            y = self._data_frame[f'{ma_type.upper()}_{self._period[0]}'],
+            x = self._dates,
+            y = self._data_frame[f'{ma_type.upper()}_{self._period[0]}'].to_numpy(),
             mode = 'lines',
             name = f'{ma_type.upper()} ({self._period[0]} days)',
-            line = {'color': self._config[self._plot_type][ma_type]['color'],
-                    'width': self._config[self._plot_type][ma_type]['width'],
+            line = {'color': ma_config['color'],
+                    'width': ma_config['width'],
                     'dash': 'solid'
                     },
             connectgaps = True,
@@ -64,17 +67,19 @@ class TimeSeriesPlotter(Plotter):
 
     def _build_buffer(self, figure:go.Figure):
         """Builds the buffer """
+        line = {
+            'color': self._plot_config['ema']['color'],
+            'width': self._plot_config['ema']['width'],
+            'dash': 'dash'
+        }
         for sign, showlegend in (('+', True), ('-', False)):
+            column = f'EMA_{self._period[0]}_{sign}'
             figure.add_trace(go.Scatter(
-                x=self._data_frame.index,
-                y=self._data_frame.get(f'EMA_{self._period[0]}_{sign}', []),
+                x=self._dates,
+                y=self._data_frame[column].to_numpy() if column in self._data_frame else [],
                 mode='lines',
                 name='buffer' if showlegend else '',
-                line={
-                    'color': self._config[self._plot_type]['ema']['color'],
-                    'width': self._config[self._plot_type]['ema']['width'],
-                    'dash': 'dash'
-                },
+                line=line,
                 connectgaps=True,
                 showlegend=showlegend,
             ))
@@ -90,26 +95,24 @@ class TimeSeriesPlotter(Plotter):
         """Displays buy / sell recommendations on the trace"""
         column = f"R_{self._period[0]}_{self._config['strategy']}"
         df = self._data_frame
+        markers_config = self._plot_config["markers"]
+        # Recommendation codes and close read once for both transaction types
+        codes = df[column].cat.codes.to_numpy()
+        close = df["adj_close"].to_numpy()
 
         for tx in ['Buy', 'Sell']:
-            filtered_df = df[df[column] == tx[0]]
+            is_tx = codes == frame.RECOMMENDATIONS.index(tx[0])
             figure.add_trace(
                 go.Scatter(
-                    x=filtered_df.index,
-                    y=filtered_df["adj_close"],
+                    x=self._dates[is_tx],
+                    y=close[is_tx],
                     mode="markers",
                     name=tx,
                     marker={
-                        "symbol": self._config[self._plot_type]["markers"][
-                            f"{tx.lower()}_symbol"
-                        ],
-                        "size": self._config[self._plot_type]["markers"]["size"],
-                        "color": self._config[self._plot_type]["markers"][
-                            f"{tx.lower()}_color"
-                        ],
-                        "line_width": self._config[self._plot_type]["markers"][
-                            "line_width"
-                        ],
+                        "symbol": markers_config[f"{tx.lower()}_symbol"],
+                        "size": markers_config["size"],
+                        "color": markers_config[f"{tx.lower()}_color"],
+                        "line_width": markers_config["line_width"],
                     },
                 )
             )
@@ -118,7 +121,7 @@ class TimeSeriesPlotter(Plotter):
     def _build_ancillaries(self, figure:go.Figure):
         """Optionally add slider and selector"""
         # Add range selector buttons
-        if self._config[self._plot_type]['range_selector']:
+        if self._plot_config['range_selector']:
             figure.update_layout(
                 xaxis = {
                     'rangeselector': {
@@ -134,7 +137,7 @@ class TimeSeriesPlotter(Plotter):
                 }
             )
         # Add range slider at the bottom
-        figure.update_xaxes = dict(visible = self._config[self._plot_type]['range_slider']),
+        figure.update_xaxes = dict(visible = self._plot_config['range_slider']),
 
 
     def plot(self):
@@ -149,13 +152,13 @@ class TimeSeriesPlotter(Plotter):
         self._build_ancillaries(fig)
         super()._build_title(
             fig,
-            {"x": self._config[self._plot_type]["x_axis_title"],
-             "y": self._config[self._plot_type]["y_axis_title"]
+            {"x": self._plot_config["x_axis_title"],
+             "y": self._plot_config["y_axis_title"]
                   + f" ({self._req.get_company_info().get('currency-symbol', '')})",
             },
         )
         # Output
-        if self._config[self._plot_type]['display']:
+        if self._plot_config['display']:
             fig.show()
-        if self._config[self._plot_type]['save']:
+        if self._plot_config['save']:
             io_util.save_figure(fig, self._config['image_dir'], self._build_fileprefix(), 'jpg')
@@ -7,38 +7,54 @@ io_utilities.py
 I/O utilities
 
 """
-import sys
 import os
+import time
+import copy
+import json
+import functools
+import pickle
 import pandas as pd
 import pprint
 import yaml
 import plotly.graph_objects as go
+import plotly.io as pio
 import utilities.system_utilities as sys_util
 
+try:  # libyaml C loader, same safe semantics as yaml.safe_load
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+YAML_CACHE_SIZE = 64 # maximum number of parsed YAML files kept in memory (least recently used evicted)
+
 
 def save_figure(
     figure: go.Figure, directory: str, fileprefix: str, extension: str
     ) -> None:
     """
-    Save a Plotly figure to an image file.
+    Save a Plotly figure to an image file, or to a standalone html file if extension is 'html'
+    (plotly.js loaded from the CDN).
 
     Args:
         figure (go.Figure): The Plotly figure to save.
         directory (str): The directory to save the file in.
         fileprefix (str): The filename prefix (without extension).
-        extension (str): The file extension (e.g., 'jpeg', 'png', 'pdf').
+        extension (str): The file extension (e.g., 'jpeg', 'png', 'pdf', 'html').
 
     The function ensures the directory exists and handles potential exceptions
     when saving the figure.
     """
-    func_name = sys._getframe().f_code.co_name  # Get function name
+    func_name = 'save_figure'
     os.makedirs(directory, exist_ok = True)
 
     filename = fileprefix + '.' + extension
     filepath = os.path.join(directory, filename)
 
     try:
-        figure.write_image(filepath)
+        if extension == 'html':
+            figure.write_html(filepath, include_plotlyjs='cdn')
+        else:
+            figure.write_image(filepath)
         print(f"[{func_name}] Figure saved as {filepath}")
     except PermissionError as e:
         sys_util.warning(f"[{func_name}] Permission denied: {filepath}", e)
@@ -50,6 +66,37 @@ def save_figure(
         sys_util.warning(f"[{func_name}] Unexpected error writing {filepath}", e)
 
 
+def save_figures(
+    figures: list, directory: str, fileprefixes: list, extension: str
+    ) -> None:
+    """
+    Save several Plotly figures to image files in one batch.
+
+    Args:
+        figures (list): The Plotly figures to save.
+        directory (str): The directory to save the files in.
+        fileprefixes (list): The filename prefixes (without extension), one per figure.
+        extension (str): The file extension shared by all figures (e.g., 'jpeg', 'png', 'pdf', 'html').
+
+    Images are rendered with plotly.io.write_images, which starts the Kaleido renderer once
+    for the whole batch instead of once per figure. html files, and image batches that
+    cannot be rendered together (e.g. Kaleido < 1.0), fall back to save_figure per figure.
+    """
+    func_name = 'save_figures'
+    if extension != 'html':
+        os.makedirs(directory, exist_ok = True)
+        filepaths = [os.path.join(directory, f'{fileprefix}.{extension}') for fileprefix in fileprefixes]
+        try:
+            pio.write_images(figures, filepaths)
+            for filepath in filepaths:
+                print(f"[{func_name}] Figure saved as {filepath}")
+            return
+        except Exception as e:
+            sys_util.warning(f"[{func_name}] Batch rendering failed, saving figures one by one", e)
+    for figure, fileprefix in zip(figures, fileprefixes):
+        save_figure(figure, directory, fileprefix, extension)
+
+
 def dataframe_to_csv(dataframe:pd.DataFrame, directory:str, fileprefix:str) -> None:
     """
     Write a pandas DataFrame to a CSV file.
@@ -62,7 +109,7 @@ def dataframe_to_csv(dataframe:pd.DataFrame, directory:str, fileprefix:str) -> N
     The function ensures the directory exists, adds a ".csv" extension if missing,
     and handles potential exceptions when saving the file.
     """
-    func_name = sys._getframe().f_code.co_name  # Get function name
+    func_name = 'dataframe_to_csv'
 
     os.makedirs(directory, exist_ok = True)
     filename = f"{fileprefix}.csv" if not fileprefix.endswith(".csv") else fileprefix
@@ -79,6 +126,156 @@ def dataframe_to_csv(dataframe:pd.DataFrame, directory:str, fileprefix:str) -> N
         sys_util.warning(f"[{func_name}] Unexpected error writing {filepath}", e)
 
 
+def dataframe_to_parquet(dataframe:pd.DataFrame, directory:str, fileprefix:str) -> None:
+    """
+    Write a pandas DataFrame to a zstd-compressed parquet file (requires pyarrow).
+
+    Args:
+        dataframe (pd.DataFrame): The DataFrame to save (DataFrame.attrs are stored as well).
+        directory (str): The directory to save the file in.
+        fileprefix (str): The filename prefix (without or with ".parquet" extension).
+
+    The function ensures the directory exists, adds a ".parquet" extension if missing,
+    and handles potential exceptions when saving the file.
+    """
+    func_name = 'dataframe_to_parquet'
+
+    os.makedirs(directory, exist_ok = True)
+    filename = f"{fileprefix}.parquet" if not fileprefix.endswith(".parquet") else fileprefix
+    filepath = os.path.join(directory, filename)
+
+    try:
+        dataframe.to_parquet(filepath, compression="zstd")
+    except ImportError as e:  # No parquet engine installed
+        sys_util.warning(f"[{func_name}] Parquet support unavailable, not writing {filepath}", e)
+    except OSError as e:  # Covers file system-related errors
+        sys_util.warning(f"[{func_name}] OS error while writing {filepath}", e)
+    except Exception as e:
+        sys_util.warning(f"[{func_name}] Unexpected error writing {filepath}", e)
+
+
+def load_parquet_file(directory:str, fileprefix:str):
+    """
+    Loads a parquet file into a pandas DataFrame.
+
+    Args:
+        directory (str): The directory containing the parquet file.
+        fileprefix (str): The filename prefix (without or with ".parquet" extension).
+
+    Returns:
+        pd.DataFrame: The contents of the parquet file, or None if the file does not exist
+        or cannot be read.
+    """
+    func_name = 'load_parquet_file'
+    filename = f"{fileprefix}.parquet" if not fileprefix.endswith(".parquet") else fileprefix
+    filepath = os.path.join(directory, filename)
+    if not os.path.exists(filepath):
+        return None
+    try:
+        return pd.read_parquet(filepath)
+    except Exception as e:
+        sys_util.warning(f"[{func_name}] Could not load {filepath}", e)
+        return None
+
+
+def json_to_file(obj, directory:str, filename:str) -> None:
+    """
+    Write a JSON-serializable Python object to file.
+
+    Args:
+        obj: The object to save.
+        directory (str): The directory to save the file in.
+        filename (str): The filename (with extension).
+
+    The function ensures the directory exists and handles potential exceptions
+    when saving the file.
+    """
+    func_name = 'json_to_file'
+
+    os.makedirs(directory, exist_ok = True)
+    filepath = os.path.join(directory, filename)
+
+    try:
+        with open(filepath, 'w', encoding = 'utf-8') as j_file:
+            json.dump(obj, j_file)
+    except OSError as e:  # Covers file system-related errors
+        sys_util.warning(f"[{func_name}] OS error while writing {filepath}", e)
+    except Exception as e:
+        sys_util.warning(f"[{func_name}] Unexpected error writing {filepath}", e)
+
+
+def load_json_file(filepath:str):
+    """
+    Loads a JSON file.
+
+    Args:
+        filepath (str): Path to the JSON file.
+
+    Returns:
+        The decoded object, or None if the file does not exist or cannot be read.
+    """
+    func_name = 'load_json_file'
+    try:
+        with open(filepath, encoding = 'utf-8') as j_file:
+            return json.load(j_file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        sys_util.warning(f"[{func_name}] Could not load {filepath}", e)
+        return None
+
+
+def pickle_to_file(obj, directory:str, filename:str) -> None:
+    """
+    Pickle a Python object to file.
+
+    Args:
+        obj: The object to save.
+        directory (str): The directory to save the file in.
+        filename (str): The filename (with extension).
+
+    The function ensures the directory exists and handles potential exceptions
+    when saving the file.
+    """
+    func_name = 'pickle_to_file'
+
+    os.makedirs(directory, exist_ok = True)
+    filepath = os.path.join(directory, filename)
+
+    try:
+        with open(filepath, 'wb') as p_file:
+            pickle.dump(obj, p_file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:  # Covers file system-related errors
+        sys_util.warning(f"[{func_name}] OS error while writing {filepath}", e)
+    except Exception as e:
+        sys_util.warning(f"[{func_name}] Unexpected error writing {filepath}", e)
+
+
+def load_pickle_file(filepath:str, max_age:float = None):
+    """
+    Loads a pickled Python object.
+
+    Args:
+        filepath (str): Path to the pickle file.
+        max_age (float): Maximum age of the file in seconds (None: no limit).
+
+    Returns:
+        The unpickled object, or None if the file does not exist, is older than max_age
+        or cannot be read.
+    """
+    func_name = 'load_pickle_file'
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(filepath) > max_age:
+            return None
+        with open(filepath, 'rb') as p_file:
+            return pickle.load(p_file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        sys_util.warning(f"[{func_name}] Could not load {filepath}", e)
+        return None
+
+
 def pretty_print(data_structure) -> None:
     """
     Utility to pretty print any Python data structure.
@@ -89,7 +286,7 @@ def pretty_print(data_structure) -> None:
     The function uses `pprint` for better readability. If the structure is not readable,
     it logs a warning.
     """
-    func_name = sys._getframe().f_code.co_name  # Get function name
+    func_name = 'pretty_print'
 
     try:
         if pprint.isreadable(data_structure):
@@ -102,6 +299,17 @@ def pretty_print(data_structure) -> None:
         sys_util.warning(f"[{func_name}] Unexpected error during pretty printing", e)
 
 
+@functools.lru_cache(maxsize=YAML_CACHE_SIZE)
+def _parse_yaml_file(yaml_filepath:str, mtime:float) -> dict:
+    """
+    Parse a YAML file, cached by load_yaml_file per (real path, modification time):
+    entries of older versions of a file are never hit again and age out of the LRU.
+    The parsed contents are shared: return copies only.
+    """
+    with open(yaml_filepath, encoding = 'utf-8') as c_file :
+        return yaml.load(c_file, Loader = _YamlLoader) or {}
+
+
 def load_yaml_file(yaml_filename:str) -> dict:
     """
     Loads a YAML file and returns its contents as a dictionary.
@@ -110,15 +318,18 @@ def load_yaml_file(yaml_filename:str) -> dict:
         yaml_filename (str): Path to the YAML file.
 
     Returns:
-        dict: The contents of the YAML file.
+        dict: The contents of the YAML file (a copy: callers may modify it).
 
      Raises:
         SystemExit: If the file is not found or another error occurs.
+
+    Parsed files are kept in memory keyed by (path, modification time): a file is only
+    re-parsed when it changes. The YAML_CACHE_SIZE most recently used files are kept.
     """
-    func_name = sys._getframe().f_code.co_name  # Get the current function name
+    func_name = 'load_yaml_file'
     try:
-         with open(yaml_filename, encoding = 'utf-8') as c_file :
-              return yaml.safe_load(c_file) or {}
+        contents = _parse_yaml_file(os.path.realpath(yaml_filename), os.path.getmtime(yaml_filename))
+        return copy.deepcopy(contents)
     except (FileNotFoundError, yaml.YAMLError) as e:
         sys_util.terminate(
             f'[{func_name}] Error loading YAML file "{yaml_filename}"', e
@@ -139,7 +350,7 @@ def load_csv_file(directory: str, csv_filename: str) -> pd.DataFrame:
     Raises:
         SystemExit: If the file is not found, empty, or has parsing errors.
     """
-    func_name = sys._getframe().f_code.co_name  # Get function name
+    func_name = 'load_csv_file'
     filepath = os.path.join(directory, csv_filename)
     try:
         return pd.read_csv(filepath)
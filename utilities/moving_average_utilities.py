@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+moving_average_utilities.py
+
+Moving average kernels on numpy arrays
+"""
+import numpy as np
+from scipy.signal import lfilter
+
+
+def exponential_moving_average(x: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential moving average, same as pandas ewm(span=span, adjust=False).mean().
+
+    Args:
+        x (np.ndarray): The series (float64).
+        span (int): The span of the moving average.
+
+    Returns:
+        np.ndarray: y[i] = alpha * x[i] + (1 - alpha) * y[i-1], alpha = 2 / (span + 1), y[0] = x[0]
+
+    The recursion is run in C by scipy's lfilter; the initial filter state
+    (1 - alpha) * x[0] seeds y[0] = x[0].
+    """
+    if len(x) == 0: # no first value to seed the filter (pandas returns an empty series)
+        return np.empty(0, x.dtype)
+    alpha = 2 / (span + 1)
+    return lfilter([alpha], [1, alpha - 1], x, zi=[(1 - alpha) * x[0]])[0]
+
+
+def cumulative_sum(x: np.ndarray) -> np.ndarray:
+    """
+    Cumulative sum of the series with a leading 0, shared by simple_moving_average calls.
+
+    Args:
+        x (np.ndarray): The series.
+
+    Returns:
+        np.ndarray: float64 array of length len(x) + 1, cum_x[i] = x[0] + ... + x[i-1].
+    """
+    return np.concatenate(([0.], np.cumsum(x, dtype=np.float64)))
+
+
+def simple_moving_average(cum_x: np.ndarray, window: int, min_periods: int = None) -> np.ndarray:
+    """
+    Simple moving average from the cumulative sum of the series (see cumulative_sum),
+    same as pandas rolling(window=window, min_periods=min_periods).mean().
+
+    Args:
+        cum_x (np.ndarray): Cumulative sum of the series with a leading 0.
+        window (int): The window of the moving average.
+        min_periods (int): Minimum number of values in the window (default: window),
+            the leading values with fewer are NaN.
+
+    Returns:
+        np.ndarray: The moving average, each value is the difference of two cumulative sums: O(N)
+        whatever the window.
+    """
+    min_periods = window if min_periods is None else min_periods
+    end = np.arange(1, len(cum_x))
+    start = np.maximum(end - window, 0)
+    count = end - start
+    sma = (cum_x[end] - cum_x[start]) / count
+    sma[count < min_periods] = np.nan
+    return sma
@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import logging
-import traceback
 import functools
 import sys
+import time
 
-logging.basicConfig(level = logging.INFO)
+# Configured once at import (basicConfig is not re-run on every terminate/warning call);
+# a no-op if the application already configured the root logger
+logging.basicConfig(level=logging.INFO,
+                    format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
-def terminate(msg: str, exception: Exception, cls_name: str, function_name: str):
+def terminate(msg: str, exception: Exception, cls_name: str = None, function_name: str = None):
     """
     Build and output an exit message that includes exception, class, and function
     from where the exception originated, then terminate the execution.
@@ -18,27 +22,22 @@ def terminate(msg: str, exception: Exception, cls_name: str, function_name: str)
         cls_name (str): The class name where the exception occurred.
         function_name (str): The function name where the exception occurred.
     """
-    # Log the termination message
-    logging.basicConfig(
-        level=logging.ERROR, format="%(asctime)s - %(levelname)s - %(message)s"
-    )
-
     # Create the termination message
     terminate_message = (
         f"{msg}\n"
         f"Exception: {exception}\n"
         f"Class: {cls_name}\n"
-        f"Function: {function_name}\n"
-        f"Traceback:\n{traceback.format_exc()}"
+        f"Function: {function_name}"
     )
 
-    logging.error(terminate_message)
+    # The handler formats the exception's traceback
+    logger.error(terminate_message, exc_info=exception)
 
     # Gracefully terminate with error code 1
     sys.exit(1)
 
 
-def warning(msg: str, exception: Exception, cls_name: str, function_name: str):
+def warning(msg: str, exception: Exception, cls_name: str = None, function_name: str = None):
     """
     Build and output a warning message that includes exception, class, and function
     from where the exception originated.
@@ -49,40 +48,63 @@ def warning(msg: str, exception: Exception, cls_name: str, function_name: str):
         cls_name (str): The class name where the exception occurred.
         function_name (str): The function name where the exception occurred.
     """
-    # Log the warning
-    logging.basicConfig(
-        level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s"
-    )
-
     # Create the formatted warning message
     warning_message = (
         f"{msg}\n"
         f"Exception: {exception}\n"
         f"Class: {cls_name}\n"
-        f"Function: {function_name}\n"
-        f"Traceback:\n{traceback.format_exc()}"
+        f"Function: {function_name}"
     )
 
-    logging.warning(warning_message)
+    logger.warning(warning_message, exc_info=exception)
+
+
+def _summary(obj) -> str:
+    """Return the type name of obj, with its length when it has one (no repr of its content)"""
+    try:
+        return f"{type(obj).__name__} of length {len(obj)}"
+    except TypeError:
+        return type(obj).__name__
 
 
 def log_execution(log_level=logging.INFO):
-    """Decorator to log functions with enhanced details."""
+    """
+    Decorator to log functions with enhanced details.
+    Messages are formatted lazily by the logging backend, and not at all when
+    log_level is disabled for the logger of the function's module.
+    The argument values and the result (whose repr may be as large as a DataFrame)
+    are only logged when DEBUG is enabled; otherwise their count, keywords and type are.
+    """
 
     def decorator(func):
+        logger = logging.getLogger(func.__module__)
+        # Message prefixes built once per function, not on every call
+        entry = f"Executing {func.__name__}"
+        finish = f"Finished executing {func.__name__}, result:"
+        error = f"Exception in {func.__name__}:"
+
         @functools.wraps(func)
         def inner(*args, **kwargs):
+            verbose = logger.isEnabledFor(logging.DEBUG)
+            enabled = verbose or logger.isEnabledFor(log_level)
             # Log the function name and arguments
-            logging.log(log_level, f"Executing {func.__name__} with arguments {args} and keyword arguments {kwargs}")
+            if verbose:
+                logger.debug("%s with arguments %r and keyword arguments %r", entry, args, kwargs)
+            elif enabled:
+                logger.log(log_level, "%s with %d arguments and keyword arguments %s",
+                           entry, len(args), list(kwargs))
 
             try:
                 result = func(*args, **kwargs)
                 # Log the result of the function call
-                logging.log(log_level, f"Finished executing {func.__name__}, result: {result}")
+                if verbose:
+                    logger.debug("%s %r", finish, result)
+                elif enabled:
+                    logger.log(log_level, "%s %s", finish, _summary(result))
                 return result
             except Exception as e:
                 # Log exception if one occurs
-                logging.error(f"Exception in {func.__name__}: {e}")
+                logger.error("%s %s", error, e)
                 raise  # Re-raise the exception to preserve the original behavior
 
         return inner
@@ -91,28 +113,75 @@ def log_execution(log_level=logging.INFO):
 
 
 
+def _uncached_if_unhashable(lookup, func, cached):
+    """
+    Wrap the cache lookup of func so that calls with unhashable arguments (lists,
+    numpy arrays, DataFrames) run func uncached instead of raising TypeError.
+    The arguments are only hashed again when the lookup raised TypeError.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return lookup(*args, **kwargs)
+        except TypeError:
+            try:
+                hash((args, tuple(kwargs.items())))
+            except TypeError:
+                return func(*args, **kwargs) # unhashable arguments: not cached
+            raise # TypeError raised by func itself
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
 def cache(func):
     """
-    Cache via decorator.
+    Cache via decorator, for pure functions with a small argument domain:
+    functools.cache is unbounded and skips the LRU bookkeeping on every hit.
+    Use lru_cache_bounded when the set of arguments is not bounded.
+    Calls with unhashable arguments are not cached.
 
     Args:
         func (callable): The function to be cached.
 
     Returns:
-        callable: The wrapped function with caching behavior.
+        callable: The wrapped function with caching behavior
+                  (exposes cache_info() and cache_clear()).
 
     """
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        # Create a key from args and kwargs
-        key = (args, frozenset(kwargs.items()))
-        if key in wrapper.cache:
-            print("Retrieving result from cache...")
-            return wrapper.cache[key]
+    cached = functools.cache(func)
+    return _uncached_if_unhashable(cached, func, cached)
 
-        result = func(*args, **kwargs)
-        wrapper.cache[key] = result
-        return result
 
-    wrapper.cache = {}
-    return wrapper
+def lru_cache_bounded(maxsize=1024, ttl=None):
+    """
+    Cache via decorator, bounded to the maxsize most recently used results
+    (functools.lru_cache: O(1) eviction from its C linked list).
+    Calls with unhashable arguments are not cached.
+
+    Args:
+        maxsize (int): Maximum number of cached results.
+        ttl (float): Time to live of the cached results in seconds (None: no expiry).
+                     Results are cached per ttl-long window of time.monotonic()
+                     and expire, at the latest, at the end of their window.
+
+    Returns:
+        callable: The decorator (wrapped functions expose cache_info() and cache_clear()).
+
+    """
+    def decorator(func):
+        if ttl is None:
+            cached = functools.lru_cache(maxsize=maxsize)(func)
+            return _uncached_if_unhashable(cached, func, cached)
+
+        @functools.lru_cache(maxsize=maxsize)
+        def cached(_window, *args, **kwargs):
+            return func(*args, **kwargs)
+
+        def lookup(*args, **kwargs):
+            return cached(time.monotonic() // ttl, *args, **kwargs)
+
+        return _uncached_if_unhashable(lookup, func, cached)
+
+    return decorator